@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Prompt construction and Gemini request/response handling, shared by the
+# Streamlit app and the batch CLI. Nothing in here may call st.*.
+import json
+
+from metrics import timed
+from section_parser import decode_structured, parse_sections, response_schema
+
+DEFAULT_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+MAX_OUTPUT_TOKENS = 500
+SECTION_MAX_OUTPUT_TOKENS = 200
+
+SECTION_HEADERS = {
+    "career": "Career Suggestions",
+    "roadmap": "Career Roadmap",
+    "skill_gap": "Skill Gap Analysis",
+    "learning": "Learning Resources",
+    "practice_websites": "Practice Websites",
+    "job_platforms": "Job Search Platforms",
+}
+# Section labels used in the combined prompt.
+PROMPT_LABELS = {
+    "career": "Career Suggestions",
+    "roadmap": "Roadmap",
+    "skill_gap": "Skill Gap",
+    "learning": "Learning Resources",
+    "practice_websites": "Practice Websites",
+    "job_platforms": "Job Search Platforms",
+}
+# Used in fan-out mode, where each section is requested on its own. The list
+# sections ask for comma-separated output so coerce_section can split them.
+SECTION_INSTRUCTIONS = {
+    "career": "Suggest careers that suit this user.",
+    "roadmap": "Give a step-by-step career roadmap as one comma-separated list of short steps.",
+    "skill_gap": "Analyse the gap between the user's current skills and their target role.",
+    "learning": "List learning resources as one comma-separated list.",
+    "practice_websites": "List practice websites as one comma-separated list.",
+    "job_platforms": "List job search platforms as one comma-separated list.",
+}
+
+# ------------------- Prompts --------------------
+def format_skills(skills):
+    return ", ".join(f"{name} ({level})" for name, level in skills)
+
+def build_user_info(age, experience, skills_input, target_role, education, location):
+    return f"""
+User Info:
+- Age: {age}
+- Experience: {experience} years
+- Skills: {skills_input}
+- Target Role: {target_role}
+- Education: {education}
+- Location: {location}
+"""
+
+def build_prompt(user_info, sections=None):
+    # sections limits the request to the ones not already answered locally.
+    labels = ", ".join(PROMPT_LABELS[key] for key in (sections or PROMPT_LABELS))
+    return f"""
+Provide career advice in labeled sections: {labels}.
+{user_info}"""
+
+def build_section_prompt(section, user_info):
+    return f"""
+{SECTION_INSTRUCTIONS[section]} Reply with the {SECTION_HEADERS[section]} content only, without a heading.
+{user_info}"""
+
+# ------------------- Gemini Requests --------------------
+def _headers(access_token):
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json"
+    }
+
+def _generation_config(max_output_tokens):
+    return {
+        "temperature": 0.7,
+        "maxOutputTokens": max_output_tokens,
+        "candidateCount": 1,
+        "topP": 0.95,
+        "topK": 40,
+    }
+
+def fetch_gemini_sections(client, prompt, access_token, api_base=DEFAULT_API_BASE, mode="text", sections=None):
+    # Returns the parsed sections dict, or {} when Gemini sent back no text.
+    # "text" parses labelled free text; "structured" asks for JSON matching
+    # response_schema(sections). sections should be the ones build_prompt was given.
+    if mode == "structured":
+        generation_config = _generation_config(MAX_OUTPUT_TOKENS)
+        generation_config["responseMimeType"] = "application/json"
+        generation_config["responseSchema"] = response_schema(list(sections or SECTION_HEADERS))
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+        url = f"{api_base}/models/gemini-pro:generateContent"
+        with timed("http"):
+            res = client.post(url, headers=_headers(access_token), json=payload)
+        with timed("json_decode"):
+            data = res.json()
+        parts, finish_reason = [], None
+        for candidate in data.get("candidates", [])[:1]:
+            finish_reason = candidate.get("finishReason")
+            parts.extend(part.get("text", "") for part in candidate.get("content", {}).get("parts", []))
+        text = "".join(parts)
+        if not text:
+            return {}
+        with timed("parse"):
+            try:
+                return decode_structured(text)
+            except ValueError as e:
+                # Raised rather than returned so a broken answer is never cached.
+                if finish_reason == "MAX_TOKENS":
+                    raise ValueError(f"Gemini's answer was cut off at the {MAX_OUTPUT_TOKENS}-token limit") from e
+                raise ValueError(f"Gemini returned malformed JSON ({e})") from e
+
+    payload = dict(_generation_config(MAX_OUTPUT_TOKENS))
+    payload["prompt"] = [{"content":[{"type":"text","text": prompt}]}]
+    url = f"{api_base}/models/gemini-pro:generateText"
+    with timed("http"):
+        res = client.post(url, headers=_headers(access_token), json=payload)
+    with timed("json_decode"):
+        data = res.json()
+    text = ""
+    if "candidates" in data and len(data["candidates"]) > 0:
+        content = data["candidates"][0].get("content", [])
+        for part in content:
+            if part.get("type") == "text":
+                text += part.get("text", "")
+    if not text:
+        return {}
+    with timed("parse"):
+        return parse_sections(text)
+
+def stream_gemini_section(client, access_token, section, user_info, on_text, api_base=DEFAULT_API_BASE):
+    # Calls on_text with each chunk as it arrives through the SSE stream.
+    payload = {
+        "contents": [{"role": "user", "parts": [{"text": build_section_prompt(section, user_info)}]}],
+        "generationConfig": _generation_config(SECTION_MAX_OUTPUT_TOKENS),
+    }
+    url = f"{api_base}/models/gemini-pro:streamGenerateContent"
+    with timed("http_stream"), \
+            client.post(url, params={"alt": "sse"}, headers=_headers(access_token), json=payload, stream=True) as res:
+        for raw in res.iter_lines(decode_unicode=True):
+            if not raw or not raw.startswith("data:"):
+                continue
+            data = json.loads(raw[len("data:"):])
+            for candidate in data.get("candidates", [])[:1]:
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        on_text(part["text"])
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# Headless batch advisor: JSONL profiles in, JSONL advice out.
+#
+#   python batch_advisor.py profiles.jsonl advice.jsonl --concurrency 8 --rate 5
+#
+# Each input line is a profile such as
+#   {"id": "s-001", "age": 21, "experience": 0,
+#    "skills": [["Python", "Intermediate"], ["SQL", "Beginner"]],
+#    "target_role": "Data Analyst", "education": "BSc Statistics", "location": "Pune"}
+# ("id" defaults to the line number; skills may be empty; every other field is
+# required, as on the app's form). Each output line is
+#   {"id": ..., "sections": {...}, "latency": seconds}
+#
+# The output file doubles as the checkpoint: on restart, profiles whose id is
+# already in it are skipped, so a crashed run resumes where it stopped. Failed
+# profiles are not written there (see --errors) and are retried on the next run;
+# input lines that are not JSON objects are reported to --errors by line number.
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from advice import DEFAULT_API_BASE, SECTION_HEADERS, build_prompt, build_user_info, fetch_gemini_sections, format_skills
+from gemini_client import GeminiClient
+from response_cache import ResponseCache, normalize_profile, profile_key
+from section_parser import has_content
+from taxonomy import load_taxonomy
+
+SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
+REQUIRED_FIELDS = ("age", "experience", "target_role", "education", "location")
+
+# ------------------- Input / Checkpoint --------------------
+def read_profiles(path, on_error=None):
+    # Streams the input so large files are never held in memory. A line that is
+    # not a JSON object with a string or integer id is reported as
+    # on_error(line_no, message) and skipped, so one bad line cannot stop the run.
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                message = f"invalid JSON: {e}"
+            else:
+                if not isinstance(record, dict):
+                    message = f"expected a JSON object, got {type(record).__name__}"
+                elif not isinstance(record.setdefault("id", line_no), (str, int)):
+                    message = f"id must be a string or integer, got {record['id']!r}"
+                else:
+                    yield record
+                    continue
+            if on_error is not None:
+                on_error(line_no, message)
+
+def load_checkpoint(path):
+    # Collects ids already written and drops a torn final line left by a crash.
+    done = set()
+    if not os.path.exists(path):
+        return done
+    good_size = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                break
+            good_size += len(line)
+    if good_size < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good_size)
+    return done
+
+def validate_profile(record):
+    # Raises ValueError naming every missing or malformed field.
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing required field(s): {', '.join(missing)}")
+    for field in ("age", "experience"):
+        try:
+            int(record[field])
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a whole number, got {record[field]!r}") from None
+
+def _skills(record):
+    skills = []
+    for skill in record.get("skills", []):
+        if isinstance(skill, dict):
+            skills.append((skill.get("name", ""), skill.get("level", "")))
+        else:
+            skills.append((skill[0], skill[1] if len(skill) > 1 else ""))
+    return skills
+
+# ------------------- Worker --------------------
+class BatchAdvisor:
+    def __init__(self, client, token_source, api_base=DEFAULT_API_BASE, mode="text", cache=None, taxonomy=None):
+        # token_source is called per request so OAuth tokens can refresh mid-run.
+        self.client = client
+        self.token_source = token_source
+        self.api_base = api_base
+        self.mode = mode
+        self.cache = cache
+        self.taxonomy = taxonomy
+
+    def advise(self, record):
+        validate_profile(record)
+        skills = _skills(record)
+        age, experience = int(record["age"]), int(record["experience"])
+        target_role, education, location = record["target_role"], record["education"], record["location"]
+        start = time.perf_counter()
+        static_sections = {}
+        if self.taxonomy is not None:
+            target_role = self.taxonomy.canonical_role(target_role)
+            location = self.taxonomy.canonical_location(location)
+            skills = [(self.taxonomy.canonical_skill(name), level) for name, level in skills]
+            static_sections = self.taxonomy.static_sections(target_role)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = profile_key(normalize_profile(age, experience, skills, target_role, education, location))
+            sections = self.cache.get(cache_key)
+            if sections is not None:
+                return {**sections, **static_sections}, time.perf_counter() - start
+        user_info = build_user_info(age, experience, format_skills(skills), target_role, education, location)
+        requested = [section for section in SECTION_HEADERS if section not in static_sections]
+        sections = fetch_gemini_sections(self.client, build_prompt(user_info, requested), self.token_source(),
+                                         self.api_base, self.mode, requested)
+        if not has_content(sections):
+            raise ValueError("Gemini returned an empty response")
+        if cache_key is not None:
+            self.cache.set(cache_key, sections)
+        return {**sections, **static_sections}, time.perf_counter() - start
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile.
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def run_batch(advisor, input_path, output_path, concurrency=4, errors_path=None, log=sys.stderr):
+    done = load_checkpoint(output_path)
+    latencies = []
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    with ExitStack() as stack:
+        out = stack.enter_context(open(output_path, "a", encoding="utf-8"))
+        errors = stack.enter_context(open(errors_path, "a", encoding="utf-8")) if errors_path else None
+        pool = stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+
+        # Results are collected on this thread only, so no locking is needed.
+        def fail(profile_id, message):
+            counts["failed"] += 1
+            if errors is not None:
+                errors.write(json.dumps({"id": profile_id, "error": message}) + "\n")
+            print(f"profile {profile_id}: {message}", file=log)
+
+        def finish(future, record):
+            try:
+                sections, latency = future.result()
+            except Exception as e:
+                fail(record["id"], str(e))
+                return
+            # One line per profile, flushed immediately, so the output is always
+            # a valid checkpoint.
+            out.write(json.dumps({"id": record["id"], "sections": sections, "latency": round(latency, 4)}) + "\n")
+            out.flush()
+            latencies.append(latency)
+            counts["ok"] += 1
+
+        in_flight = {}
+        try:
+            for record in read_profiles(input_path, on_error=fail):
+                if record["id"] in done:
+                    counts["skipped"] += 1
+                    continue
+                # Keep at most two batches queued so the input is consumed lazily.
+                while len(in_flight) >= concurrency * 2:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future, in_flight.pop(future))
+                in_flight[pool.submit(advisor.advise, record)] = record
+        finally:
+            # The pool waits for these on exit anyway; record them so work that
+            # finished before an interruption is not lost from the checkpoint.
+            for future in list(in_flight):
+                finish(future, in_flight.pop(future))
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ok": counts["ok"],
+        "failed": counts["failed"],
+        "skipped": counts["skipped"],
+        "elapsed": elapsed,
+        "throughput": counts["ok"] / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+    }
+
+# ------------------- CLI --------------------
+def _access_token_source(args):
+    token = args.token or os.getenv("GEMINI_ACCESS_TOKEN")
+    if token:
+        return lambda: token
+    # Imported here so runs against a stub need no Google auth libraries.
+    from credentials import CredentialProvider
+    provider = CredentialProvider(args.credentials, args.token_file, SCOPES)
+    return provider.get_token
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate career advice for a JSONL file of profiles.")
+    parser.add_argument("input", help="JSONL file of profiles")
+    parser.add_argument("output", help="JSONL file to append advice to; also the resume checkpoint")
+    parser.add_argument("--errors", help="JSONL file to append failed profiles to")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight at once")
+    parser.add_argument("--rate", type=float, default=5.0, help="max requests per second")
+    parser.add_argument("--burst", type=int, default=10, help="token bucket size for --rate")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=60.0, help="read timeout in seconds")
+    parser.add_argument("--api-base", default=os.getenv("GEMINI_API_BASE", DEFAULT_API_BASE))
+    parser.add_argument("--mode", choices=["text", "structured"], default=os.getenv("GEMINI_RESPONSE_MODE", "text"))
+    parser.add_argument("--cache", help="SQLite response cache to read from and fill")
+    parser.add_argument("--no-taxonomy", action="store_true",
+                        help="send skills, role and location as typed instead of canonicalizing them")
+    parser.add_argument("--token", help="access token (default: $GEMINI_ACCESS_TOKEN, else OAuth)")
+    parser.add_argument("--credentials", default="credentials.json")
+    parser.add_argument("--token-file", default="token.pickle")
+    args = parser.parse_args(argv)
+
+    client = GeminiClient(read_timeout=args.timeout, max_retries=args.retries, rate=args.rate,
+                          burst=args.burst, pool_size=max(args.concurrency, 1))
+    cache = ResponseCache(path=args.cache) if args.cache else None
+    taxonomy = None if args.no_taxonomy else load_taxonomy()
+    advisor = BatchAdvisor(client, _access_token_source(args), args.api_base, args.mode, cache, taxonomy)
+    try:
+        summary = run_batch(advisor, args.input, args.output, args.concurrency, args.errors)
+    finally:
+        client.close()
+
+    print(f"ok={summary['ok']} failed={summary['failed']} skipped={summary['skipped']} "
+          f"elapsed={summary['elapsed']:.1f}s throughput={summary['throughput']:.2f}/s "
+          f"p50={summary['p50'] * 1000:.0f}ms p95={summary['p95'] * 1000:.0f}ms")
+    client_stats = client.stats()
+    limiter = client_stats.pop("limiter")
+    print("client " + " ".join(f"{key}={value}" for key, value in client_stats.items())
+          + f" max_queue_depth={limiter['max_queue_depth']} avg_wait={limiter['avg_wait'] * 1000:.0f}ms")
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(f"cache hits={cache_stats['hits'] + cache_stats['disk_hits']} misses={cache_stats['misses']} "
+              f"hit_rate={cache_stats['hit_rate']:.0%}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# End-to-end benchmark: drives career_advisor.py headlessly with Streamlit's
+# AppTest against the local stub Gemini server.
+#
+#   python benchmarks/bench_app.py --latency 0.3 --items 8 --sessions 8 --submits 5
+#
+# Reports rerun cost with results on screen, submit-to-render latency, and
+# throughput with N concurrent sessions, then the per-phase histograms the app
+# recorded (token, http, json_decode, parse, render_*, rerun).
+#
+# AppTest keeps one Streamlit runtime per process (and swaps in the app as
+# __main__), so every session runs in a spawned worker process and their phase
+# histograms are merged here. The process-wide response cache and single-flight
+# layer are therefore not shared between simulated sessions.
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from metrics import REGISTRY
+from stub_gemini_server import make_response, start_stub_server
+
+APP_PATH = os.path.join(ROOT, "career_advisor.py")
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+def new_session():
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state.logged_in = True
+    at.session_state.username = "bench"
+    at.run()
+    return at
+
+def submit(at, education, stream=False):
+    # Fills the form and returns seconds from clicking submit to the results
+    # tabs being rendered.
+    inputs = at.text_input
+    inputs[0].input("Python")
+    inputs[1].input("SQL")
+    inputs[3].input("Data Analyst")
+    inputs[4].input(education)
+    inputs[5].input("Pune")
+    if stream:
+        at.checkbox[0].check()
+    start = time.perf_counter()
+    at.button[0].click().run()
+    elapsed = time.perf_counter() - start
+    if at.exception or not at.session_state.sections:
+        raise RuntimeError(f"submit failed: {at.exception or at.error}")
+    return elapsed
+
+def rerun_worker(reruns, env):
+    os.environ.update(env)
+    at = new_session()
+    submit(at, "rerun-baseline")
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def session_worker(session_id, submits, stream, cached, env, ready, go):
+    os.environ.update(env)
+    new_session()  # warm imports and caches before the clock starts
+    ready.wait()
+    go.wait()
+    latencies, errors = [], []
+    started = time.time()
+    for i in range(submits):
+        # Distinct education strings defeat the response cache unless
+        # --cached asks for the repeat-profile path.
+        education = "BSc" if cached else f"bench-{session_id}-{i}"
+        try:
+            latencies.append(submit(new_session(), education, stream))
+        except Exception as e:
+            errors.append(str(e))
+    return latencies, errors, started, time.time(), REGISTRY.export_state()
+
+def bench_sessions(context, sessions, submits, stream, cached, env):
+    manager = context.Manager()
+    ready, go = manager.Barrier(sessions + 1), manager.Event()
+    with context.Pool(sessions) as pool:
+        pending = [pool.apply_async(session_worker, (n, submits, stream, cached, env, ready, go))
+                   for n in range(sessions)]
+        # Bounded so a worker that dies while warming up fails the run instead of hanging it.
+        ready.wait(300)
+        go.set()
+        results = [result.get() for result in pending]
+    latencies, errors = [], []
+    for worker_latencies, worker_errors, _, _, state in results:
+        latencies.extend(worker_latencies)
+        errors.extend(worker_errors)
+        REGISTRY.merge_state(state)
+    elapsed = max(r[3] for r in results) - min(r[2] for r in results)
+    return latencies, errors, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the advisor app end to end against a stub Gemini server.")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub response latency in seconds")
+    parser.add_argument("--items", type=int, default=5, help="entries per section in stub responses")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent sessions")
+    parser.add_argument("--submits", type=int, default=3, help="submits per session")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns to time with results on screen")
+    parser.add_argument("--rate", type=float, default=1000.0, help="client rate limit (requests/s)")
+    parser.add_argument("--stream", action="store_true", help="use per-section fan-out mode")
+    parser.add_argument("--cached", action="store_true", help="submit the same profile every time")
+    parser.add_argument("--json", help="write the results and phase histograms to this JSON file")
+    parser.add_argument("--prom", help="write the phase histograms in Prometheus text format to this file")
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency, response_text=make_response(args.items))
+    env = {
+        "GEMINI_API_BASE": f"http://127.0.0.1:{server.server_port}/v1beta",
+        "GEMINI_ACCESS_TOKEN": "benchmark",
+        "GEMINI_RATE_PER_SEC": str(args.rate),
+        "GEMINI_RATE_BURST": str(max(1, int(args.rate))),
+        "RESPONSE_CACHE_PATH": "",
+    }
+    # spawn, not fork: the stub server threads' locks must not leak into workers.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        reruns = pool.apply(rerun_worker, (args.reruns, env))
+    server.config.requests = 0
+    latencies, errors, elapsed = bench_sessions(context, args.sessions, args.submits, args.stream, args.cached, env)
+
+    results = {
+        "config": vars(args),
+        "rerun_ms": {"p50": percentile(reruns, 50) * 1000, "p95": percentile(reruns, 95) * 1000},
+        "submit_to_render_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "mean": statistics.mean(latencies) * 1000 if latencies else 0.0,
+        },
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "submits": len(latencies),
+        "errors": len(errors),
+        "upstream_requests": server.config.requests,
+        "phases": REGISTRY.snapshot(),
+    }
+    server.shutdown()
+
+    print(f"stub latency {args.latency * 1000:.0f} ms, {args.items} items/section, "
+          f"{args.sessions} sessions x {args.submits} submits{' (fan-out)' if args.stream else ''}")
+    print(f"rerun with results:  p50 {results['rerun_ms']['p50']:.1f} ms  p95 {results['rerun_ms']['p95']:.1f} ms")
+    print(f"submit to render:    p50 {results['submit_to_render_ms']['p50']:.1f} ms  "
+          f"p95 {results['submit_to_render_ms']['p95']:.1f} ms")
+    print(f"throughput:          {results['throughput_per_s']:.2f} submits/s "
+          f"({results['submits']} ok, {results['errors']} failed, {results['upstream_requests']} upstream requests)")
+    print(f"{'phase':<20} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for phase, stats in results["phases"].items():
+        print(f"{phase:<20} {stats['count']:>6} {stats['p50'] * 1000:>9.2f} "
+              f"{stats['p95'] * 1000:>9.2f} {stats['p99'] * 1000:>9.2f}")
+    if errors:
+        print(f"first error: {errors[0]}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.prom:
+        REGISTRY.write_prometheus(args.prom)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
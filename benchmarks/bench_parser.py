@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Parse throughput and misclassification rate over recorded Gemini responses.
+#
+#   python benchmarks/bench_parser.py --repeat 2000
+#
+# Compares the original substring-chain splitter (plus the comma re-splitting
+# the tabs used to do) with section_parser.parse_sections, and times
+# decode_structured on the JSON form of the same answers.
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from section_parser import LIST_SECTIONS, SECTION_KEYS, decode_structured, parse_sections
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "responses.jsonl")
+
+def legacy_parse(text):
+    sections = {key: "" for key in SECTION_KEYS}
+    current_section = "career"
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line: continue
+        l_lower = line.lower()
+        if "roadmap" in l_lower: current_section="roadmap"; continue
+        elif "skill gap" in l_lower: current_section="skill_gap"; continue
+        elif "learning" in l_lower: current_section="learning"; continue
+        elif "practice" in l_lower: current_section="practice_websites"; continue
+        elif "job" in l_lower: current_section="job_platforms"; continue
+        sections[current_section] += line + "\n"
+    for key in LIST_SECTIONS:
+        sections[key] = [item.strip() for item in sections[key].replace("\n", ",").split(",") if item.strip()]
+    sections["career"] = sections["career"].strip()
+    sections["skill_gap"] = sections["skill_gap"].strip()
+    return sections
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _items(key, value):
+    if key in LIST_SECTIONS:
+        return [item.lower() for item in value]
+    return [line.strip().lower() for line in value.splitlines() if line.strip()]
+
+def misclassification_rate(parse, corpus):
+    # Share of expected items (list entries, text lines) that do not land in
+    # their own section.
+    total = wrong = 0
+    for entry in corpus:
+        parsed = parse(entry["text"])
+        for key, value in entry["expected"].items():
+            got = set(_items(key, parsed.get(key) or ([] if key in LIST_SECTIONS else "")))
+            for item in _items(key, value):
+                total += 1
+                wrong += item not in got
+    return wrong / total if total else 0.0
+
+def throughput(parse, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            parse(text)
+    elapsed = time.perf_counter() - start
+    count = repeat * len(texts)
+    size = repeat * sum(len(text.encode("utf-8")) for text in texts)
+    return count / elapsed, size / elapsed / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini response section parsing.")
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    texts = [entry["text"] for entry in corpus]
+    json_corpus = [dict(entry, text=json.dumps(entry["expected"])) for entry in corpus]
+    json_texts = [entry["text"] for entry in json_corpus]
+
+    print(f"{len(corpus)} recorded responses, {args.repeat} passes")
+    print(f"{'parser':<22} {'responses/s':>12} {'MB/s':>8} {'misclassified':>14}")
+    for name, parse, inputs, entries in (
+        ("legacy substring", legacy_parse, texts, corpus),
+        ("line-based single-pass", parse_sections, texts, corpus),
+        ("structured (JSON)", decode_structured, json_texts, json_corpus),
+    ):
+        rate, mbps = throughput(parse, inputs, args.repeat)
+        print(f"{name:<22} {rate:>12.0f} {mbps:>8.2f} {misclassification_rate(parse, entries):>13.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Per-click cost of the Roadmap tab, before and after memoization/fragments.
+#
+#   python benchmarks/bench_roadmap.py --steps 10 50 200 --clicks 20
+#
+# Columns (median ms):
+#   legacy build    the baseline's DOT build from the comma-joined roadmap text
+#   cached build    roadmap_dot_source on a repeated completion state
+#   legacy tab      a click in a script running the baseline Roadmap tab code
+#                   (re-split text, unkeyed checkboxes, uncached chart)
+#   fragment tab    a click in a script holding only the render_roadmap fragment
+#   app rerun       a click that reruns the whole current app; AppTest does not
+#                   scope reruns to fragments, so this is the cost the fragment
+#                   saves in the browser, not a measurement of the old app
+#
+# The baseline app authenticates with Google at import time and cannot run
+# here, so "legacy tab" versus "fragment tab" is the before/after comparison
+# for the tab itself.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("GEMINI_ACCESS_TOKEN", "benchmark")
+os.environ.setdefault("RESPONSE_CACHE_PATH", "")
+
+from streamlit.testing.v1 import AppTest
+
+from graphviz import Digraph
+
+from roadmap import roadmap_dot_source
+
+def make_steps(n):
+    return tuple(f"Step {i}: practise topic {i} with a small project" for i in range(n))
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+# Copied from the baseline career_advisor.py.
+def legacy_generate_graphviz_roadmap(steps):
+    dot = Digraph(comment="Career Roadmap", format='png')
+    colors = ["#4a90e2", "#50e3c2", "#f5a623", "#9013fe", "#d0021b", "#7ed321"]
+    for i, step in enumerate(steps):
+        color = colors[i % len(colors)]
+        dot.node(str(i), step, style="filled", fillcolor=color, fontcolor="white", shape="box", fontsize="14")
+        if i > 0:
+            dot.edge(str(i-1), str(i), color="#333333", arrowsize="1.0")
+    return dot
+
+def legacy_split(roadmap_text):
+    return [s.strip() for s in roadmap_text.replace("\\n", ",").split(",") if s.strip()]
+
+def bench_build(steps, repeat):
+    # Legacy clicks re-split the comma-joined roadmap text and rebuilt the graph.
+    roadmap_text = ", ".join(steps)
+    completed = tuple(i % 2 == 0 for i in range(len(steps)))
+    legacy = time_calls(lambda: legacy_generate_graphviz_roadmap(legacy_split(roadmap_text)).source, repeat)
+    roadmap_dot_source(steps, completed)
+    cached = time_calls(lambda: roadmap_dot_source(steps, completed), repeat)
+    return legacy, cached
+
+def legacy_tab_script():
+    # The baseline Roadmap tab, as it ran on every click.
+    import streamlit as st
+    from benchmarks.bench_roadmap import legacy_generate_graphviz_roadmap, legacy_split
+    st.header("Career Roadmap")
+    roadmap_text = st.session_state.roadmap_text
+    if roadmap_text:
+        steps = legacy_split(roadmap_text)
+        for item in steps:
+            st.checkbox(item)
+        st.graphviz_chart(legacy_generate_graphviz_roadmap(steps))
+    else:
+        st.info("No roadmap data available.")
+
+def fragment_script():
+    import streamlit as st
+    from roadmap import render_roadmap
+    render_roadmap(st.session_state.steps)
+
+def bench_clicks(at, clicks):
+    at.run()
+    boxes = len(at.checkbox)
+    samples = []
+    for i in range(clicks):
+        box = at.checkbox[i % boxes]
+        start = time.perf_counter()
+        box.set_value(not box.value).run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def full_app(steps):
+    at = AppTest.from_file(os.path.join(ROOT, "career_advisor.py"), default_timeout=60)
+    at.session_state.logged_in = True
+    at.session_state.username = "bench"
+    at.session_state.form_submitted = True
+    at.session_state.sections = {"career": "Data Analyst", "roadmap": list(steps), "skill_gap": "Statistics",
+                                 "learning": ["Coursera", "edX"], "practice_websites": ["LeetCode", "Kaggle"],
+                                 "job_platforms": ["LinkedIn", "Indeed"]}
+    return at
+
+def legacy_tab_app(steps):
+    at = AppTest.from_function(legacy_tab_script, default_timeout=60)
+    at.session_state.roadmap_text = ", ".join(steps)
+    return at
+
+def fragment_app(steps):
+    at = AppTest.from_function(fragment_script, default_timeout=60)
+    at.session_state.steps = steps
+    return at
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark roadmap rendering per checkbox click.")
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--clicks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'steps':>6} {'legacy build':>13} {'cached build':>13} {'legacy tab':>11} {'fragment tab':>13} "
+          f"{'app rerun':>10}  (median ms)")
+    for n in args.steps:
+        steps = make_steps(n)
+        legacy, cached = bench_build(steps, args.repeat)
+        legacy_tab = bench_clicks(legacy_tab_app(steps), args.clicks)
+        fragment = bench_clicks(fragment_app(steps), args.clicks)
+        full = bench_clicks(full_app(steps), args.clicks)
+        print(f"{n:>6} {legacy:>13.3f} {cached:>13.3f} {legacy_tab:>11.1f} {fragment:>13.1f} {full:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Per-field canonicalization latency of the local taxonomy index.
+#
+#   python benchmarks/bench_taxonomy.py --repeat 20000
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from taxonomy import load_taxonomy
+
+# (field, input) pairs covering exact aliases, fuzzy hits and misses.
+SAMPLES = [
+    ("skill", "ML"),
+    ("skill", "Machine-Learning "),
+    ("skill", "kubernets"),
+    ("skill", "basket weaving"),
+    ("role", "data scientst"),
+    ("role", "Sr. Data Analyst"),
+    ("role", "Senior Product Manager"),
+    ("role", "Production Manager"),
+    ("role", "astronaut"),
+    ("location", "bangalore"),
+    ("location", "san fransisco"),
+    ("location", "Reykjavik"),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark taxonomy matching per field.")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    taxonomy = load_taxonomy()
+    print(f"index load: {(time.perf_counter() - start) * 1000:.1f} ms (once per process)")
+
+    match = {"skill": taxonomy.canonical_skill, "role": taxonomy.canonical_role,
+             "location": taxonomy.canonical_location}
+    print(f"{'field':<9} {'input':<18} {'canonical':<30} {'us/call':>8}")
+    per_call = []
+    for field, text in SAMPLES:
+        fn = match[field]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = fn(text)
+        elapsed = (time.perf_counter() - start) / args.repeat * 1e6
+        per_call.append(elapsed)
+        print(f"{field:<9} {text!r:<18} {result:<30} {elapsed:>8.1f}")
+    print(f"median {statistics.median(per_call):.1f} us, max {max(per_call):.1f} us per field")
+
+if __name__ == "__main__":
+    main()
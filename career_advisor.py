@@ -1,33 +1,96 @@
 # -*- coding: utf-8 -*-
 import os
 import streamlit as st
-import requests
-import json
-import pickle
-from graphviz import Digraph
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from advice import (DEFAULT_API_BASE, SECTION_HEADERS, build_prompt, build_user_info, fetch_gemini_sections,
+                    format_skills, stream_gemini_section)
+from credentials import CredentialProvider
+from gemini_client import GeminiClient
+from metrics import REGISTRY, start_periodic_export, timed
+from roadmap import render_roadmap
+from response_cache import ResponseCache, normalize_profile, profile_key
+from section_parser import coerce_section, has_content
+from single_flight import SingleFlight, prompt_key
+from taxonomy import load_taxonomy
+
+_rerun_started = time.perf_counter()
 
 # ------------------- OAuth 2.0 Setup --------------------
 SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
 CREDENTIALS_FILE = 'credentials.json'  # Your OAuth 2.0 JSON file
+TOKEN_FILE = 'token.pickle'
+
+@st.cache_resource
+def get_credential_provider():
+    # Loaded once per process and refreshed in the background, so reruns do no
+    # token I/O. GEMINI_ACCESS_TOKEN skips OAuth entirely (e.g. for the stub server).
+    return CredentialProvider(CREDENTIALS_FILE, TOKEN_FILE, SCOPES,
+                              static_token=os.getenv("GEMINI_ACCESS_TOKEN"))
+
+get_credential_provider()
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", DEFAULT_API_BASE)
+# "text" parses labelled free text; "structured" asks for JSON matching the response schema.
+GEMINI_RESPONSE_MODE = os.getenv("GEMINI_RESPONSE_MODE", "text")
+
+# ------------------- HTTP Client --------------------
+@st.cache_resource
+def get_gemini_client():
+    # One pooled keep-alive session and one rate limiter for the whole process.
+    client = GeminiClient(
+        connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", 5)),
+        read_timeout=float(os.getenv("GEMINI_READ_TIMEOUT", 60)),
+        max_retries=int(os.getenv("GEMINI_MAX_RETRIES", 4)),
+        rate=float(os.getenv("GEMINI_RATE_PER_SEC", 5)),
+        burst=int(os.getenv("GEMINI_RATE_BURST", 10)),
+    )
+    REGISTRY.register("gemini_client", client.stats)
+    return client
+
+# ------------------- Request Coalescing --------------------
+SINGLE_FLIGHT_MAX_WAIT = float(os.getenv("SINGLE_FLIGHT_MAX_WAIT", 90))
+
+@st.cache_resource
+def get_single_flight():
+    # Sessions that submit the same prompt while it is in flight share one call.
+    single_flight = SingleFlight(max_wait=SINGLE_FLIGHT_MAX_WAIT)
+    REGISTRY.register("single_flight", single_flight.stats)
+    return single_flight
 
-creds = None
-if os.path.exists('token.pickle'):
-    with open('token.pickle', 'rb') as token:
-        creds = pickle.load(token)
+# ------------------- Response Cache --------------------
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "response_cache.sqlite3")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 24 * 60 * 60))
 
-if not creds or not creds.valid:
-    if creds and creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-    else:
-        flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
-        creds = flow.run_local_server(port=0)
-    with open('token.pickle', 'wb') as token:
-        pickle.dump(creds, token)
+@st.cache_resource
+def get_response_cache():
+    # Shared by every session in this process; the SQLite tier survives restarts.
+    cache = ResponseCache(path=RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL)
+    REGISTRY.register("response_cache", cache.stats)
+    return cache
 
-ACCESS_TOKEN = creds.token
-GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateText"
+# ------------------- Taxonomy --------------------
+@st.cache_resource
+def get_taxonomy():
+    # Canonicalizes free-text skills, roles and locations, and answers the
+    # practice-website and job-platform tabs for catalogued roles.
+    return load_taxonomy()
+
+# ------------------- Metrics --------------------
+METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH")
+METRICS_PROM_PATH = os.getenv("METRICS_PROM_PATH")
+
+@st.cache_resource
+def start_metrics_export():
+    # Per-phase latency histograms (token, http, json_decode, parse, render_*,
+    # rerun) and the client, cache and single-flight stats registered above
+    # are always collected; they are only written out when a path is set.
+    if METRICS_JSON_PATH or METRICS_PROM_PATH:
+        start_periodic_export(REGISTRY, METRICS_JSON_PATH, METRICS_PROM_PATH,
+                              float(os.getenv("METRICS_EXPORT_INTERVAL", 15)))
+    return REGISTRY
+
+start_metrics_export()
 
 # ------------------- CSS Styling --------------------
 st.markdown("""
@@ -53,76 +116,96 @@ if "form_submitted" not in st.session_state:
     st.session_state.form_submitted = False
 if "sections" not in st.session_state:
     st.session_state.sections = {}
+# Per-section error messages; kept here so they survive the st.rerun() that
+# follows generation.
+if "section_errors" not in st.session_state:
+    st.session_state.section_errors = {}
 
 # ------------------- Helper Functions --------------------
 def render_badges(items, badge_class="badge"):
     badges_html = "".join([f"<span class='{badge_class}'>{item}</span>" for item in items])
     st.markdown(badges_html, unsafe_allow_html=True)
 
-def roadmap_with_checkboxes(items):
-    for item in items:
-        st.checkbox(item)
-
-def generate_graphviz_roadmap(steps):
-    dot = Digraph(comment="Career Roadmap", format='png')
-    colors = ["#4a90e2", "#50e3c2", "#f5a623", "#9013fe", "#d0021b", "#7ed321"]
-    for i, step in enumerate(steps):
-        color = colors[i % len(colors)]
-        dot.node(str(i), step, style="filled", fillcolor=color, fontcolor="white", shape="box", fontsize="14")
-        if i > 0:
-            dot.edge(str(i-1), str(i), color="#333333", arrowsize="1.0")
-    return dot
-
-def generate_gemini_response(prompt):
-    headers = {
-        "Authorization": f"Bearer {ACCESS_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "temperature": 0.7,
-        "maxOutputTokens": 500,
-        "candidateCount": 1,
-        "topP": 0.95,
-        "topK": 40,
-        "prompt": [{"content":[{"type":"text","text": prompt}]}]
-    }
+def render_section_error(section):
+    error = st.session_state.section_errors.get(section)
+    if error:
+        st.error(error)
+
+def generate_gemini_response(prompt, profile=None, requested=None):
+    # Returns (sections, error message or None). requested names the sections
+    # the prompt asks for.
+    cache = get_response_cache()
+    cache_key = profile_key(profile) if profile is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, None
     try:
-        res = requests.post(GEMINI_URL, headers=headers, json=payload)
-        res.raise_for_status()
-        data = res.json()
-        text = ""
-        if "candidates" in data and len(data["candidates"]) > 0:
-            content = data["candidates"][0].get("content", [])
-            for part in content:
-                if part.get("type") == "text":
-                    text += part.get("text", "")
-        if not text:
-            st.warning("⚠️ Gemini returned an empty response.")
-            return {}
-        sections = {
-            "career": "",
-            "roadmap": "",
-            "skill_gap": "",
-            "learning": "",
-            "practice_websites": "",
-            "job_platforms": "",
-        }
-        lines = text.split("\n")
-        current_section = "career"
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            l_lower = line.lower()
-            if "roadmap" in l_lower: current_section="roadmap"; continue
-            elif "skill gap" in l_lower: current_section="skill_gap"; continue
-            elif "learning" in l_lower: current_section="learning"; continue
-            elif "practice" in l_lower: current_section="practice_websites"; continue
-            elif "job" in l_lower: current_section="job_platforms"; continue
-            sections[current_section] += line + "\n"
-        return sections
+        with timed("token"):
+            access_token = get_credential_provider().get_token()
+        sections = get_single_flight().do(prompt_key(prompt), lambda: fetch_gemini_sections(
+            get_gemini_client(), prompt, access_token, GEMINI_API_BASE, GEMINI_RESPONSE_MODE, requested))
     except Exception as e:
-        st.error(f"Error calling Gemini API: {e}")
-        return {}
+        return {}, f"Error calling Gemini API: {e}"
+    if not has_content(sections):
+        return {}, "⚠️ Gemini returned an empty response."
+    if cache_key is not None:
+        cache.set(cache_key, sections)
+    return sections, None
+
+def _section_worker(client, access_token, section, user_info, events):
+    try:
+        stream_gemini_section(client, access_token, section, user_info,
+                              lambda text: events.put((section, "text", text)), GEMINI_API_BASE)
+        events.put((section, "done", None))
+    except Exception as e:
+        events.put((section, "error", e))
+
+def generate_gemini_sections_streaming(user_info, placeholders, profile=None, requested=None):
+    # Returns (sections, errors). Failed or empty sections are left out of
+    # sections so the tabs fall back to their defaults; errors maps each
+    # failed section to its message.
+    cache = get_response_cache()
+    cache_key = profile_key(profile) if profile is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, {}
+
+    requested = list(requested or SECTION_HEADERS)
+    client = get_gemini_client()
+    try:
+        with timed("token"):
+            access_token = get_credential_provider().get_token()
+    except Exception as e:
+        return {}, {section: f"Error calling Gemini API: {e}" for section in requested}
+    texts = {section: "" for section in requested}
+    errors = {}
+    events = queue.Queue()
+    # One request per section; the script thread drains the queue and is the
+    # only one writing to the placeholders.
+    with ThreadPoolExecutor(max_workers=len(requested)) as pool:
+        for section in requested:
+            pool.submit(_section_worker, client, access_token, section, user_info, events)
+        pending = len(requested)
+        while pending:
+            section, kind, value = events.get()
+            if kind == "text":
+                texts[section] += value
+                placeholders[section].markdown(texts[section])
+                continue
+            pending -= 1
+            if kind == "error":
+                errors[section] = f"Error calling Gemini API: {value}"
+                placeholders[section].error(errors[section])
+            elif not texts[section].strip():
+                placeholders[section].warning("⚠️ Gemini returned an empty response.")
+
+    sections = {section: coerce_section(section, text) for section, text in texts.items()
+                if section not in errors and text.strip()}
+    if cache_key is not None and not errors:
+        cache.set(cache_key, sections)
+    return sections, errors
 
 # ------------------- Login Page --------------------
 if not st.session_state.logged_in:
@@ -159,6 +242,7 @@ else:
             target_role = st.text_input("Target Role / Career Goal")
             education = st.text_input("Education Background")
             location = st.text_input("Preferred Job Location")
+            stream_sections = st.checkbox("Show each section as soon as it is ready")
             submitted = st.form_submit_button("Get Career Advice")
             if submitted:
                 if all([target_role.strip(), education.strip(), location.strip()]):
@@ -167,22 +251,33 @@ else:
                     st.session_state.target_role = target_role
                     st.session_state.education = education
                     st.session_state.location = location
-                    st.session_state.skills_input = f"{skill_1} ({prof_1}), {skill_2} ({prof_2}), {skill_3} ({prof_3})"
+                    taxonomy = get_taxonomy()
+                    target_role = taxonomy.canonical_role(target_role)
+                    location = taxonomy.canonical_location(location)
+                    skills = [(taxonomy.canonical_skill(skill_1), prof_1),
+                              (taxonomy.canonical_skill(skill_2), prof_2),
+                              (taxonomy.canonical_skill(skill_3), prof_3)]
+                    static_sections = taxonomy.static_sections(target_role)
+                    requested = [section for section in SECTION_HEADERS if section not in static_sections]
+                    st.session_state.skills_input = format_skills(skills)
                     st.session_state.form_submitted = True
+                    profile = normalize_profile(age, experience, skills, target_role, education, location)
 
-                    prompt = f"""
-Provide career advice in labeled sections: Career Suggestions, Roadmap, Skill Gap, Learning Resources, Practice Websites, Job Search Platforms.
-
-User Info:
-- Age: {age}
-- Experience: {experience} years
-- Skills: {st.session_state.skills_input}
-- Target Role: {target_role}
-- Education: {education}
-- Location: {location}
-"""
-                    with st.spinner("Generating your personalized career advice..."):
-                        st.session_state.sections = generate_gemini_response(prompt)
+                    user_info = build_user_info(age, experience, st.session_state.skills_input,
+                                                target_role, education, location)
+                    st.session_state.section_errors = {}
+                    if stream_sections:
+                        # The results view fans out one request per section and
+                        # fills each tab as its answer streams in.
+                        st.session_state.sections = static_sections
+                        st.session_state.pending_request = (user_info, profile, requested)
+                    else:
+                        with st.spinner("Generating your personalized career advice..."), timed("generate"):
+                            sections, error = generate_gemini_response(build_prompt(user_info, requested), profile,
+                                                                     requested)
+                        st.session_state.sections = {**sections, **static_sections}
+                        if error:
+                            st.session_state.section_errors = {section: error for section in requested}
                     st.rerun()
 
     if st.session_state.form_submitted:
@@ -198,44 +293,71 @@ User Info:
             "Job Search Platforms"
         ])
 
+        if st.session_state.get("pending_request"):
+            user_info, profile, requested = st.session_state.pending_request
+            placeholders = {}
+            for tab, (section, header) in zip(tabs, SECTION_HEADERS.items()):
+                with tab:
+                    st.header(header)
+                    if section in sections:
+                        render_badges(sections[section], badge_class="link-badge")
+                    else:
+                        placeholders[section] = st.empty()
+                        placeholders[section].info("Generating...")
+            with timed("generate_streaming"):
+                streamed, errors = generate_gemini_sections_streaming(user_info, placeholders, profile, requested)
+            st.session_state.sections = {**streamed, **sections}
+            st.session_state.section_errors = errors
+            st.session_state.pending_request = None
+            st.rerun()
+
+        render_started = time.perf_counter()
         with tabs[0]:
             st.header("Career Suggestions")
+            render_section_error("career")
             st.markdown(sections.get("career", "No career suggestions available."))
 
         with tabs[1]:
             st.header("Career Roadmap")
-            roadmap_text = sections.get("roadmap", "")
-            if roadmap_text:
-                steps = [s.strip() for s in roadmap_text.replace("\\n", ",").split(",") if s.strip()]
-                roadmap_with_checkboxes(steps)
-                st.graphviz_chart(generate_graphviz_roadmap(steps))
+            render_section_error("roadmap")
+            steps = sections.get("roadmap", [])
+            if steps:
+                render_roadmap(tuple(steps))
             else:
                 st.info("No roadmap data available.")
 
         with tabs[2]:
             st.header("Skill Gap Analysis")
+            render_section_error("skill_gap")
             st.markdown(sections.get("skill_gap", "No skill gap analysis available."))
 
         with tabs[3]:
             st.header("Learning Resources")
-            learning_text = sections.get("learning", "")
-            if learning_text:
-                render_badges([r.strip() for r in learning_text.split(",")])
+            render_section_error("learning")
+            resources = sections.get("learning", [])
+            if resources:
+                render_badges(resources)
             else:
                 st.info("No learning resources provided.")
 
         with tabs[4]:
             st.header("Practice Websites")
-            practice_text = sections.get("practice_websites", "")
-            if practice_text:
-                render_badges([l.strip() for l in practice_text.split(",")], badge_class="link-badge")
+            render_section_error("practice_websites")
+            practice_sites = sections.get("practice_websites", [])
+            if practice_sites:
+                render_badges(practice_sites, badge_class="link-badge")
             else:
                 st.info("No practice websites listed.")
 
         with tabs[5]:
             st.header("Job Search Platforms")
-            jobs_text = sections.get("job_platforms", "")
-            if jobs_text:
-                render_badges([l.strip() for l in jobs_text.split(",")], badge_class="link-badge")
+            render_section_error("job_platforms")
+            job_platforms = sections.get("job_platforms", [])
+            if job_platforms:
+                render_badges(job_platforms, badge_class="link-badge")
             else:
                 st.info("No job search platforms listed.")
+        REGISTRY.observe("render_tabs", time.perf_counter() - render_started)
+
+# Reruns that end in st.rerun() stop early and are not counted here.
+REGISTRY.observe("rerun", time.perf_counter() - _rerun_started)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import pickle
+import threading
+from contextlib import contextmanager
+
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+REFRESH_MARGIN_SECONDS = 5 * 60
+RETRY_DELAY_SECONDS = 30
+
+# ------------------- File Lock --------------------
+@contextmanager
+def file_lock(path):
+    # Advisory lock on a sidecar file so several worker processes do not read a
+    # half-written token file or refresh the same token at once.
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+# ------------------- Credential Provider --------------------
+def _seconds_left(creds):
+    if creds is None or not creds.token:
+        return 0
+    if creds.expiry is None:
+        return float("inf")
+    # google-auth stores expiry as a naive UTC datetime.
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds()
+
+class CredentialProvider:
+    def __init__(self, credentials_file, token_file, scopes,
+                 refresh_margin=REFRESH_MARGIN_SECONDS, static_token=None):
+        self.credentials_file = credentials_file
+        self.token_file = token_file
+        self.lock_file = token_file + ".lock"
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self.static_token = static_token
+        self._creds = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if static_token:
+            # Fixed token (stub server, batch jobs): nothing to load or refresh.
+            return
+        with self._refresh_lock:
+            self._creds = self._load_or_authorize()
+        self._thread = threading.Thread(target=self._refresh_loop, name="token-refresh", daemon=True)
+        self._thread.start()
+
+    def get_token(self):
+        if self.static_token:
+            return self.static_token
+        creds = self._creds
+        if _seconds_left(creds) > 0:
+            return creds.token
+        # Only block the caller when the background refresh fell behind and the
+        # token has actually expired.
+        with self._refresh_lock:
+            if _seconds_left(self._creds) <= 0:
+                self._creds = self._refresh(self._creds)
+            return self._creds.token
+
+    def close(self):
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while True:
+            delay = max(0, _seconds_left(self._creds) - self.refresh_margin)
+            if self._stop.wait(min(delay, 24 * 60 * 60)):
+                return
+            if _seconds_left(self._creds) > self.refresh_margin:
+                continue
+            try:
+                with self._refresh_lock:
+                    if _seconds_left(self._creds) <= self.refresh_margin:
+                        self._creds = self._refresh(self._creds)
+            except Exception:
+                # Keep serving the current token; get_token() refreshes inline
+                # if it really runs out before a retry succeeds.
+                if self._stop.wait(RETRY_DELAY_SECONDS):
+                    return
+
+    def _read_token_file(self):
+        if not os.path.exists(self.token_file):
+            return None
+        with open(self.token_file, "rb") as token:
+            return pickle.load(token)
+
+    def _write_token_file(self, creds):
+        tmp_path = f"{self.token_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as token:
+            pickle.dump(creds, token)
+        os.replace(tmp_path, self.token_file)
+
+    def _load_or_authorize(self):
+        with file_lock(self.lock_file):
+            creds = self._read_token_file()
+            if creds and creds.valid:
+                return creds
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
+                creds = flow.run_local_server(port=0)
+            self._write_token_file(creds)
+            return creds
+
+    def _refresh(self, creds):
+        with file_lock(self.lock_file):
+            # Another process may already have refreshed and saved a newer token.
+            stored = self._read_token_file()
+            if _seconds_left(stored) > self.refresh_margin:
+                return stored
+            creds.refresh(Request())
+            self._write_token_file(creds)
+            return creds
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ------------------- Rate Limiter --------------------
+class TokenBucket:
+    # Process-wide limiter: callers block in acquire() until a token is free, so
+    # bursts queue up here instead of turning into 429s upstream.
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._total_wait = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self._acquired += 1
+                        self._total_wait += now - start
+                        return True
+                    delay = (1 - self._tokens) / self.rate
+                    if timeout is not None:
+                        remaining = timeout - (now - start)
+                        if remaining <= 0:
+                            return False
+                        delay = min(delay, remaining)
+                    self._cond.wait(delay)
+            finally:
+                self._waiting -= 1
+                self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "acquired": self._acquired,
+                "avg_wait": self._total_wait / self._acquired if self._acquired else 0.0,
+            }
+
+# ------------------- HTTP Client --------------------
+def _retry_after_seconds(res):
+    value = res.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class GeminiClient:
+    def __init__(self, connect_timeout=5.0, read_timeout=60.0, max_retries=4,
+                 backoff_base=0.5, backoff_max=20.0, rate=5.0, burst=10, pool_size=32):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        # Retries are handled below so they also pass through the limiter.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _backoff(self, attempt):
+        # Full jitter keeps many sessions retrying at once from re-synchronising.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def post(self, url, headers=None, json=None, params=None, stream=False):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            self._count("requests")
+            try:
+                res = self.session.post(url, headers=headers, json=json, params=params,
+                                        stream=stream, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if res.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if not res.ok:
+                        self._count("failures")
+                        # Release the pooled connection now; a streamed body
+                        # would otherwise hold it until garbage collection.
+                        res.close()
+                    res.raise_for_status()
+                    return res
+                retry_after = _retry_after_seconds(res)
+                delay = min(self.backoff_max, retry_after) if retry_after is not None else self._backoff(attempt)
+                res.close()
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats["limiter"] = self.limiter.stats()
+        return stats
+
+    def close(self):
+        self.session.close()
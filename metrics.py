@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds; wide enough for both parsing (sub-ms) and a slow
+# upstream call (tens of seconds).
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+# ------------------- Histogram --------------------
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def state(self):
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def merge(self, counts, count, total):
+        with self._lock:
+            self.counts = [a + b for a, b in zip(self.counts, counts)]
+            self.count += count
+            self.sum += total
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation,
+        # the same estimate Prometheus' histogram_quantile() makes.
+        counts, total, _ = self.state()
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-2]
+
+    def snapshot(self):
+        _, count, total = self.state()
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+# ------------------- Registry --------------------
+class PhaseMetrics:
+    def __init__(self, name="advisor_phase_seconds", buckets=DEFAULT_BUCKETS, namespace="advisor"):
+        self.name = name
+        self.buckets = buckets
+        self.namespace = namespace
+        self._phases = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def register(self, component, stats_fn):
+        # stats_fn returns a dict of numbers (nested dicts are flattened with
+        # "_"); it is polled at export time and published as gauges.
+        with self._lock:
+            self._collectors[component] = stats_fn
+
+    def histogram(self, phase):
+        hist = self._phases.get(phase)
+        if hist is None:
+            with self._lock:
+                hist = self._phases.setdefault(phase, Histogram(self.buckets))
+        return hist
+
+    def observe(self, phase, seconds):
+        self.histogram(phase).observe(seconds)
+
+    @contextmanager
+    def timer(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._phases = {}
+
+    def snapshot(self):
+        with self._lock:
+            phases = dict(self._phases)
+        return {phase: hist.snapshot() for phase, hist in sorted(phases.items())}
+
+    def collect(self):
+        with self._lock:
+            collectors = dict(self._collectors)
+        return {component: _flatten(stats_fn()) for component, stats_fn in sorted(collectors.items())}
+
+    # Raw bucket state, for combining registries from several processes.
+    def export_state(self):
+        with self._lock:
+            phases = dict(self._phases)
+        return {phase: hist.state() for phase, hist in phases.items()}
+
+    def merge_state(self, state):
+        for phase, (counts, count, total) in state.items():
+            self.histogram(phase).merge(counts, count, total)
+
+    def to_prometheus(self):
+        with self._lock:
+            phases = dict(self._phases)
+        lines = [f"# HELP {self.name} Time spent per advisor phase.", f"# TYPE {self.name} histogram"]
+        for phase, hist in sorted(phases.items()):
+            counts, count, total = hist.state()
+            cumulative = 0
+            for bound, bucket_count in zip(hist.buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{phase="{phase}",le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{phase="{phase}"}} {total}')
+            lines.append(f'{self.name}_count{{phase="{phase}"}} {count}')
+        for component, stats in self.collect().items():
+            for key, value in stats.items():
+                metric = f"{self.namespace}_{component}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps({"phases": self.snapshot(), "components": self.collect()}, indent=2))
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.to_prometheus())
+
+def _flatten(stats, prefix=""):
+    flat = {}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}_"))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = int(value) if isinstance(value, bool) else value
+    return flat
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def start_periodic_export(metrics, json_path=None, prom_path=None, interval=15.0):
+    # Daemon thread that rewrites the export files every interval seconds.
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                if json_path:
+                    metrics.write_json(json_path)
+                if prom_path:
+                    metrics.write_prometheus(prom_path)
+            except Exception as e:
+                # A failing write or stats callback must not end the thread;
+                # report it and try again next interval.
+                print(f"metrics export failed: {e!r}", file=sys.stderr)
+    thread = threading.Thread(target=loop, name="metrics-export", daemon=True)
+    thread.start()
+    return thread
+
+# Process-wide registry used by the app, advice.py and the benchmarks.
+REGISTRY = PhaseMetrics()
+timed = REGISTRY.timer
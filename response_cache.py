@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Bump when the prompt or the shape of the cached sections changes so old
+# entries stop matching instead of being served with the wrong layout.
+CACHE_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_ENTRIES = 5000
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SWEEP_INTERVAL = 64
+
+# ------------------- Profile Normalization --------------------
+def _fold(value):
+    return " ".join(str(value or "").split()).lower()
+
+def normalize_profile(age, experience, skills, target_role, education, location):
+    # skills is an iterable of (name, level) pairs; blank names are dropped and
+    # order is ignored so "Python, SQL" and "sql, python " share an entry.
+    skill_pairs = sorted({(_fold(name), _fold(level)) for name, level in skills if _fold(name)})
+    return {
+        "age": int(age),
+        "experience": int(experience),
+        "skills": [list(pair) for pair in skill_pairs],
+        "target_role": _fold(target_role),
+        "education": _fold(education),
+        "location": _fold(location),
+    }
+
+def profile_key(profile):
+    blob = json.dumps(profile, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"v{CACHE_VERSION}:{blob}".encode("utf-8")).hexdigest()
+
+# ------------------- Two-Tier Cache --------------------
+class ResponseCache:
+    # self._lock guards the in-memory LRU and counters and is never held during
+    # SQLite I/O; self._disk_lock serialises use of the shared connection. The
+    # disk tier is swept for expired and excess rows every sweep_interval
+    # writes, so it can briefly hold up to that many rows over its limit.
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES, ttl=DEFAULT_TTL_SECONDS,
+                 sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.sweep_interval = max(1, sweep_interval)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._writes_since_sweep = 0
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+        }
+        self._db = None
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path):
+        try:
+            db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)")
+            self._db = db
+        except sqlite3.Error:
+            # The on-disk tier is an optimisation; run memory-only if it is unusable.
+            self._db = None
+            return
+        # Start from a swept table so rows left by earlier runs do not linger
+        # until the first sweep_interval writes.
+        self._count("disk_evictions", self._disk_sweep())
+
+    def get(self, key):
+        now = time.time()
+        expired = False
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                del self._memory[key]
+                expired = True
+
+        row = self._disk_get(key)
+        if row is not None:
+            raw, expires_at = row
+            if expires_at > now:
+                value = json.loads(raw)
+                with self._lock:
+                    self._remember(key, expires_at, value)
+                    self._counters["disk_hits"] += 1
+                return value
+            self._disk_delete(key)
+            expired = True
+
+        with self._lock:
+            if expired:
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+        self._count("disk_evictions", self._disk_set(key, value, expires_at))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            self._disk_execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._memory)
+            stats["disk_enabled"] = self._db is not None
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, name, amount):
+        if amount:
+            with self._lock:
+                self._counters[name] += amount
+
+    # Expects self._lock to be held.
+    def _remember(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # The disk helpers below take self._disk_lock and must be called without
+    # self._lock; _disk_execute expects self._disk_lock to be held.
+    def _disk_execute(self, sql, params=()):
+        if self._db is None:
+            return None
+        try:
+            return self._db.execute(sql, params)
+        except sqlite3.Error:
+            return None
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        with self._disk_lock:
+            cur = self._disk_execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,))
+            return cur.fetchone() if cur is not None else None
+
+    def _disk_delete(self, key):
+        with self._disk_lock:
+            self._disk_execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _disk_set(self, key, value, expires_at):
+        # Returns the number of rows evicted by a sweep, if one ran.
+        if self._db is None:
+            return 0
+        raw = json.dumps(value)
+        with self._disk_lock:
+            cur = self._disk_execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, raw, expires_at),
+            )
+            if cur is None:
+                return 0
+            self._writes_since_sweep += 1
+            if self._writes_since_sweep < self.sweep_interval:
+                return 0
+        return self._disk_sweep()
+
+    def _disk_sweep(self):
+        with self._disk_lock:
+            self._writes_since_sweep = 0
+            self._disk_execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            cur = self._disk_execute("SELECT COUNT(*) FROM responses")
+            count = cur.fetchone()[0] if cur is not None else 0
+            overflow = count - self.max_disk_entries
+            if overflow <= 0:
+                return 0
+            # Entries share one TTL, so the soonest to expire are the oldest writes.
+            self._disk_execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY expires_at LIMIT ?)",
+                (overflow,),
+            )
+            return overflow
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import streamlit as st
+from graphviz import Digraph
+
+from metrics import timed
+
+ROADMAP_COLORS = ["#4a90e2", "#50e3c2", "#f5a623", "#9013fe", "#d0021b", "#7ed321"]
+COMPLETED_COLOR = "#d9dee4"
+COMPLETED_FONT_COLOR = "#52606d"
+
+def generate_graphviz_roadmap(steps, completed=()):
+    # Completed steps only change fill and font colour. Labels, node ids and
+    # edges stay the same, so every node keeps its size and the chart keeps
+    # its layout as boxes are ticked.
+    dot = Digraph(comment="Career Roadmap", format='png')
+    for i, step in enumerate(steps):
+        done = i < len(completed) and completed[i]
+        color = COMPLETED_COLOR if done else ROADMAP_COLORS[i % len(ROADMAP_COLORS)]
+        fontcolor = COMPLETED_FONT_COLOR if done else "white"
+        dot.node(str(i), step, style="filled", fillcolor=color, fontcolor=fontcolor, shape="box", fontsize="14")
+        if i > 0:
+            dot.edge(str(i-1), str(i), color="#333333", arrowsize="1.0")
+    return dot
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def roadmap_dot_source(steps, completed):
+    # Keyed on the step list and completion state, so toggling a box back to a
+    # state seen before is a cache hit.
+    return generate_graphviz_roadmap(steps, completed).source
+
+def roadmap_with_checkboxes(items):
+    return tuple(st.checkbox(item, key=f"roadmap_step_{i}") for i, item in enumerate(items))
+
+@st.fragment
+def render_roadmap(steps):
+    # A fragment: ticking a step reruns only this function, not the whole app.
+    with timed("render_roadmap"):
+        completed = roadmap_with_checkboxes(steps)
+        st.graphviz_chart(roadmap_dot_source(steps, completed))
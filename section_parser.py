@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import json
+import operator
+
+SECTION_KEYS = ("career", "roadmap", "skill_gap", "learning", "practice_websites", "job_platforms")
+# These come back as lists of steps / resources / links; the rest are free text.
+LIST_SECTIONS = frozenset(("roadmap", "learning", "practice_websites", "job_platforms"))
+
+def response_schema(sections=SECTION_KEYS):
+    # JSON schema sent with structured-output requests, covering only the
+    # sections asked for so the model does not write ones answered locally.
+    return {
+        "type": "OBJECT",
+        "properties": {
+            key: {"type": "ARRAY", "items": {"type": "STRING"}} if key in LIST_SECTIONS else {"type": "STRING"}
+            for key in sections
+        },
+        "required": list(sections),
+    }
+
+_HEADER_NAMES = {
+    "career suggestions": "career",
+    "career suggestion": "career",
+    "careers": "career",
+    "career roadmap": "roadmap",
+    "roadmap": "roadmap",
+    "skill gap analysis": "skill_gap",
+    "skill gap": "skill_gap",
+    "skill gaps": "skill_gap",
+    "learning resources": "learning",
+    "learning resource": "learning",
+    "practice websites": "practice_websites",
+    "practice website": "practice_websites",
+    "job search platforms": "job_platforms",
+    "job search platform": "job_platforms",
+    "job platforms": "job_platforms",
+}
+# A header is a whole line naming a section, optionally decorated as markdown
+# ("## Roadmap", "**Skill Gap:**", "3. Learning Resources") and optionally
+# followed by inline content after a colon ("Practice Websites: LeetCode, Kaggle").
+# Stripping the decoration leaves a key for _HEADER_NAMES, so recognising a
+# header costs a few string methods and one dict lookup per line.
+_HEADER_DECORATION = "#*0123456789.) \t"
+_HEADER_TRAILER = ":* \t"
+# Longer lines cannot be a header on their own, only "Header: content".
+_MAX_HEADER_LENGTH = max(map(len, _HEADER_NAMES)) + 24
+
+_BULLET_START = "-*•0123456789"
+
+def _strip_bullet(line):
+    # "- item", "* item", "• item", "1. item", "2) item" -> "item"
+    first = line[0]
+    if first in "-*•":
+        if line[1:2].isspace():
+            return line[2:]
+    elif first.isdigit():
+        head, _, rest = line.partition(" ")
+        if head[-1] in ".)" and head[:-1].isdigit():
+            return rest
+    return line
+
+def _text_lines(text):
+    # Non-empty lines, stripped.
+    return "\n".join(filter(None, map(str.strip, text.splitlines())))
+
+_strip_item = operator.methodcaller("strip", "* \t")
+
+def _list_items(lines):
+    # One item per comma-separated entry on lines whose bullets are already
+    # removed; bold markers and whitespace are stripped from each item.
+    return list(filter(None, map(_strip_item, ",".join(lines).split(","))))
+
+def parse_sections(text):
+    # Single pass: each line is either a header that switches the current
+    # section or content appended to that section's line buffer. A line naming
+    # a section with trailing text but no colon ("Roadmap planning is key") is
+    # content.
+    names = _HEADER_NAMES
+    buffers = {key: [] for key in SECTION_KEYS}
+    current, in_list = buffers["career"], False
+    for line in map(str.strip, text.splitlines()):
+        if not line:
+            continue
+        if len(line) <= _MAX_HEADER_LENGTH:
+            key = names.get(line.lstrip(_HEADER_DECORATION).rstrip(_HEADER_TRAILER).lower())
+            if key is not None:
+                current, in_list = buffers[key], key in LIST_SECTIONS
+                continue
+        if ":" in line:
+            head, rest = line.split(":", 1)
+            key = None
+            if len(head) <= _MAX_HEADER_LENGTH:
+                key = names.get(head.lstrip(_HEADER_DECORATION).rstrip(_HEADER_TRAILER).lower())
+            if key is not None:
+                current, in_list = buffers[key], key in LIST_SECTIONS
+                line = rest.lstrip("* \t")
+                if not line:
+                    continue
+        if in_list and line[0] in _BULLET_START:
+            line = _strip_bullet(line)
+        current.append(line)
+
+    sections = {}
+    for key, lines in buffers.items():
+        sections[key] = _list_items(lines) if key in LIST_SECTIONS else "\n".join(lines)
+    return sections
+
+def coerce_section(key, value):
+    # Normalises one section from any source (JSON field, streamed text).
+    if key in LIST_SECTIONS:
+        if isinstance(value, str):
+            lines = _text_lines(value).splitlines()
+            return _list_items([_strip_bullet(line) if line[0] in _BULLET_START else line for line in lines])
+        return [str(item).strip() for item in value or [] if str(item).strip()]
+    if isinstance(value, list):
+        return "\n".join(str(item).strip() for item in value if str(item).strip())
+    return _text_lines(str(value or ""))
+
+def decode_structured(text):
+    # Structured-output mode: the model returns JSON matching response_schema().
+    # Plain text goes through the text parser. Text that starts like JSON but
+    # does not decode to an object raises ValueError: it is usually an answer
+    # cut off at the token limit, and the text parser would file the raw JSON
+    # under Career.
+    if not text.lstrip().startswith(("{", "[")):
+        return parse_sections(text)
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    return {key: coerce_section(key, data.get(key)) for key in SECTION_KEYS}
+
+def has_content(sections):
+    return any(sections.get(key) for key in SECTION_KEYS)
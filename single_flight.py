@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import threading
+from concurrent import futures
+
+DEFAULT_MAX_WAIT = 90.0
+
+def prompt_key(prompt):
+    # Whitespace and case never change the advice, so fold them before hashing.
+    folded = " ".join(prompt.split()).lower()
+    return hashlib.sha256(folded.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    # The first caller for a key runs the call; callers arriving while it is in
+    # flight wait on the same Future and get its result or its exception
+    # (any Exception; a cancelled leader surfaces to waiters as RuntimeError).
+    def __init__(self, max_wait=DEFAULT_MAX_WAIT):
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {"calls": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    def do(self, key, fn, timeout=None):
+        with self._lock:
+            entry = self._calls.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._calls[key] = {"future": futures.Future(), "waiters": 0}
+                self._counters["calls"] += 1
+            else:
+                entry["waiters"] += 1
+                self._counters["coalesced"] += 1
+        future = entry["future"]
+
+        if leader:
+            try:
+                result = fn()
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:
+                    self._counters["errors"] += 1
+                raise
+            except BaseException:
+                # Control-flow exceptions (KeyboardInterrupt, Streamlit's
+                # StopException/RerunException) belong to the leader's thread;
+                # re-raising them in a waiter would stop someone else's run.
+                future.set_exception(RuntimeError("coalesced request was cancelled"))
+                with self._lock:
+                    self._counters["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+            future.set_result(result)
+            return result
+
+        try:
+            return future.result(timeout=self.max_wait if timeout is None else timeout)
+        except futures.TimeoutError:
+            with self._lock:
+                self._counters["timeouts"] += 1
+            raise TimeoutError("Timed out waiting for an identical request already in progress")
+        finally:
+            with self._lock:
+                entry["waiters"] -= 1
+
+    def waiters(self, key):
+        with self._lock:
+            entry = self._calls.get(key)
+            return entry["waiters"] if entry is not None else 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._calls)
+            stats["waiting"] = sum(entry["waiters"] for entry in self._calls.values())
+        return stats
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Local stand-in for the Gemini endpoints, for exercising the app and the HTTP
+# client without credentials or quota:
+#
+#   python stub_gemini_server.py --port 8765 --latency 0.5 --error-rate 0.2
+#   GEMINI_API_BASE=http://127.0.0.1:8765/v1beta streamlit run career_advisor.py
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from advice import PROMPT_LABELS, SECTION_HEADERS
+from section_parser import LIST_SECTIONS, parse_sections
+
+CANNED_RESPONSE = """Career Suggestions
+Data Analyst, Machine Learning Engineer, Business Intelligence Developer
+Roadmap
+Learn Python, Master SQL, Study statistics, Build a portfolio, Apply for internships
+Skill Gap
+Strengthen statistics and cloud deployment experience.
+Learning Resources
+Coursera, edX, Kaggle Learn
+Practice Websites
+LeetCode, HackerRank, Kaggle
+Job Search Platforms
+LinkedIn, Indeed, Glassdoor
+"""
+
+_SECTION_PROMPT_RE = re.compile(r"Reply with the (.+?) content only")
+_SECTION_BY_HEADER = {header: key for key, header in SECTION_HEADERS.items()}
+
+def make_response(items):
+    # A labelled answer with `items` entries per section, for sizing tests.
+    lines = []
+    for key, label in PROMPT_LABELS.items():
+        lines.append(label)
+        if key in LIST_SECTIONS:
+            lines.append(", ".join(f"{label} item {i}" for i in range(items)))
+        else:
+            lines.extend(f"{label} detail {i} for this profile." for i in range(items))
+    return "\n".join(lines) + "\n"
+
+class StubConfig:
+    def __init__(self, latency=0.0, error_rate=0.0, retry_after=None, response_text=CANNED_RESPONSE, chunk_size=40,
+                 error_status=429, fail_first=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        # The first fail_first requests always get error_status, for scripted retry tests.
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self.response_text = response_text
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self.lock = threading.Lock()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        config = self.server.config
+        with config.lock:
+            config.requests += 1
+            scripted_failure = config.requests <= config.fail_first
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if config.latency:
+            time.sleep(config.latency)
+        if scripted_failure or (config.error_rate and random.random() < config.error_rate):
+            status = config.error_status
+            self._send_json(status, {"error": {"code": status, "message": "stub error"}})
+            return
+        if ":streamGenerateContent" in self.path:
+            self._send_stream(config, body)
+        elif ":generateContent" in self.path:
+            text = config.response_text
+            if body.get("generationConfig", {}).get("responseMimeType") == "application/json":
+                text = json.dumps(parse_sections(text))
+            self._send_json(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]})
+        else:
+            self._send_json(200, {"candidates": [{"content": [{"type": "text", "text": config.response_text}]}]})
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status in (429, 503) and self.server.config.retry_after is not None:
+            self.send_header("Retry-After", str(self.server.config.retry_after))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, config, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        text = config.response_text
+        # Fan-out mode asks for one section per request; answer with just that one.
+        prompt = "".join(part.get("text", "") for content in body.get("contents", [])
+                         for part in content.get("parts", []))
+        match = _SECTION_PROMPT_RE.search(prompt)
+        if match and match.group(1) in _SECTION_BY_HEADER:
+            value = parse_sections(text)[_SECTION_BY_HEADER[match.group(1)]]
+            text = ", ".join(value) if isinstance(value, list) else value
+        for i in range(0, len(text), config.chunk_size):
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": text[i:i + config.chunk_size]}]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+        self.close_connection = True
+
+def start_stub_server(port=0, **config):
+    # Returns the running server; its base URL is http://127.0.0.1:<server.server_port>/v1beta
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.config = StubConfig(**config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the Gemini API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=429, help="HTTP status used for errors")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After header sent with 429/503 errors")
+    parser.add_argument("--items", type=int, default=None, help="entries per section (default: a short canned answer)")
+    args = parser.parse_args()
+    config = {"latency": args.latency, "error_rate": args.error_rate, "retry_after": args.retry_after,
+              "error_status": args.error_status}
+    if args.items is not None:
+        config["response_text"] = make_response(args.items)
+    server = start_stub_server(args.port, **config)
+    print(f"Stub Gemini API on http://127.0.0.1:{server.server_port}/v1beta")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+from collections import defaultdict
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomy.json")
+# Sections the catalog can answer without a model call.
+STATIC_SECTIONS = ("practice_websites", "job_platforms")
+
+# Trigram Dice score needed to shortlist a candidate; acceptance is decided below.
+MIN_SIMILARITY = 0.5
+# A fuzzy hit must be a typo of the input word by word: the same number of
+# words, each equal to the alias's word or (for words of MIN_TYPO_LENGTH or
+# more) one edit away, with at most MAX_TYPO_EDITS edits in total.
+# "kubernets" becomes "Kubernetes", but "Production Manager" stays as typed
+# rather than turning into "Product Manager".
+MIN_TYPO_LENGTH = 5
+MAX_TYPO_EDITS = 2
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9+#.]+")
+
+def normalize_term(text):
+    # "Machine-Learning " -> "machine learning"; keeps c++, c#, node.js intact.
+    return _NON_WORD_RE.sub(" ", str(text or "").lower()).strip(" .")
+
+def _trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _within_one_edit(a, b):
+    # True when b is a single insertion, deletion, substitution or swap of two
+    # adjacent characters away from a.
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    return i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+
+def _typo_edits(words, candidate_words):
+    # Edits needed to turn words into candidate_words, or None when they are
+    # not a word-by-word typo of each other.
+    if len(words) != len(candidate_words):
+        return None
+    edits = 0
+    for word, candidate in zip(words, candidate_words):
+        if word == candidate:
+            continue
+        if min(len(word), len(candidate)) < MIN_TYPO_LENGTH or not _within_one_edit(word, candidate):
+            return None
+        edits += 1
+        if edits > MAX_TYPO_EDITS:
+            return None
+    return edits
+
+# ------------------- Fuzzy Matcher --------------------
+class FuzzyMatcher:
+    # Exact alias lookup first, then a character-trigram inverted index scored
+    # with the Dice coefficient to find typo candidates, each confirmed word by
+    # word with _typo_edits.
+    def __init__(self, entries):
+        self._exact = {}
+        self._terms = []
+        self._index = defaultdict(list)
+        for canonical, aliases in entries.items():
+            for alias in [canonical, *aliases]:
+                term = normalize_term(alias)
+                if not term or term in self._exact:
+                    continue
+                self._exact[term] = canonical
+                grams = _trigrams(term)
+                term_id = len(self._terms)
+                self._terms.append((canonical, term.split(), len(grams)))
+                for gram in grams:
+                    self._index[gram].append(term_id)
+
+    def match(self, text):
+        # Returns the canonical name, or None when nothing is close enough.
+        term = normalize_term(text)
+        if not term:
+            return None
+        canonical = self._exact.get(term)
+        if canonical is not None or len(term) < MIN_TYPO_LENGTH:
+            return canonical
+        grams = _trigrams(term)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for term_id in self._index.get(gram, ()):
+                overlap[term_id] += 1
+        words = term.split()
+        best, best_rank = None, None
+        for term_id, shared in overlap.items():
+            name, candidate_words, size = self._terms[term_id]
+            score = 2 * shared / (len(grams) + size)
+            if score < MIN_SIMILARITY:
+                continue
+            edits = _typo_edits(words, candidate_words)
+            if edits is None:
+                continue
+            # Fewest edits wins; ties go to the most similar alias.
+            rank = (edits, -score)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = name, rank
+        return best
+
+# ------------------- Taxonomy --------------------
+class Taxonomy:
+    def __init__(self, data):
+        self.skills = FuzzyMatcher(data.get("skills", {}))
+        self.roles = FuzzyMatcher(data.get("roles", {}))
+        self.locations = FuzzyMatcher(data.get("locations", {}))
+        self.catalog = data.get("catalog", {})
+
+    # Unknown values pass through (trimmed) so free text still reaches the model.
+    def canonical_skill(self, text):
+        return self.skills.match(text) or " ".join(str(text or "").split())
+
+    def canonical_role(self, text):
+        return self.roles.match(text) or " ".join(str(text or "").split())
+
+    def canonical_location(self, text):
+        return self.locations.match(text) or " ".join(str(text or "").split())
+
+    def static_sections(self, role):
+        # Curated answers for a canonical role; {} when the role is not catalogued.
+        entry = self.catalog.get(role, {})
+        return {section: list(entry[section]) for section in STATIC_SECTIONS if entry.get(section)}
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    with open(path, encoding="utf-8") as f:
+        return Taxonomy(json.load(f))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from advice import MAX_OUTPUT_TOKENS, fetch_gemini_sections
+from batch_advisor import BatchAdvisor
+from response_cache import ResponseCache
+from taxonomy import Taxonomy
+
+ANSWER = {
+    "career": "Data analyst roles suit you",
+    "roadmap": ["Learn SQL", "Build dashboards"],
+    "skill_gap": "Statistics",
+    "learning": ["Coursera"],
+    "practice_websites": ["Kaggle"],
+    "job_platforms": ["LinkedIn"],
+}
+
+PROFILE = {"id": 1, "age": 30, "experience": 5, "target_role": "Data Analyst", "education": "BSc", "location": "Pune"}
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+class FakeClient:
+    # Answers every request with one candidate holding text.
+    def __init__(self, text, finish_reason="STOP"):
+        self.text = text
+        self.finish_reason = finish_reason
+        self.payloads = []
+
+    def post(self, url, headers=None, json=None, params=None, stream=False):
+        self.payloads.append(json)
+        candidate = {"content": {"role": "model", "parts": [{"text": self.text}]}, "finishReason": self.finish_reason}
+        return FakeResponse({"candidates": [candidate]})
+
+def test_structured_answer_is_decoded():
+    sections = fetch_gemini_sections(FakeClient(json.dumps(ANSWER)), "prompt", "token", mode="structured")
+    assert sections == ANSWER
+
+def test_cut_off_structured_answer_raises():
+    text = json.dumps(ANSWER, indent=0)[:150]
+    client = FakeClient(text, finish_reason="MAX_TOKENS")
+    with pytest.raises(ValueError, match=f"cut off at the {MAX_OUTPUT_TOKENS}-token limit"):
+        fetch_gemini_sections(client, "prompt", "token", mode="structured")
+
+def test_malformed_structured_answer_raises():
+    with pytest.raises(ValueError, match="malformed JSON"):
+        fetch_gemini_sections(FakeClient('{"career": '), "prompt", "token", mode="structured")
+
+def test_plain_text_in_structured_mode_is_parsed():
+    sections = fetch_gemini_sections(FakeClient("Roadmap\n- Learn SQL"), "prompt", "token", mode="structured")
+    assert sections["roadmap"] == ["Learn SQL"]
+
+def test_cut_off_answer_is_not_cached():
+    cache = ResponseCache()
+    client = FakeClient(json.dumps(ANSWER)[:100], finish_reason="MAX_TOKENS")
+    advisor = BatchAdvisor(client, lambda: "token", mode="structured", cache=cache)
+    with pytest.raises(ValueError, match="cut off"):
+        advisor.advise(PROFILE)
+    assert cache.stats()["entries"] == 0
+
+def test_structured_schema_covers_only_requested_sections():
+    client = FakeClient(json.dumps({"career": "Analyst", "skill_gap": "SQL"}))
+    sections = fetch_gemini_sections(client, "prompt", "token", mode="structured", sections=["career", "skill_gap"])
+    schema = client.payloads[0]["generationConfig"]["responseSchema"]
+    assert schema["required"] == ["career", "skill_gap"]
+    assert set(schema["properties"]) == {"career", "skill_gap"}
+    assert sections["career"] == "Analyst"
+    assert sections["roadmap"] == []
+
+def test_batch_advisor_requests_only_sections_missing_from_the_catalog():
+    taxonomy = Taxonomy({"catalog": {"Data Analyst": {"practice_websites": ["Kaggle"], "job_platforms": ["Naukri"]}}})
+    client = FakeClient(json.dumps({key: ANSWER[key] for key in ("career", "roadmap", "skill_gap", "learning")}))
+    advisor = BatchAdvisor(client, lambda: "token", mode="structured", taxonomy=taxonomy)
+    sections, _ = advisor.advise(PROFILE)
+    schema = client.payloads[0]["generationConfig"]["responseSchema"]
+    assert schema["required"] == ["career", "roadmap", "skill_gap", "learning"]
+    assert sections["practice_websites"] == ["Kaggle"]
+    assert sections["job_platforms"] == ["Naukri"]
+    assert sections["roadmap"] == ANSWER["roadmap"]
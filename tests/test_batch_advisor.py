@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+import pytest
+
+from batch_advisor import load_checkpoint, main, read_profiles, run_batch, validate_profile
+from stub_gemini_server import start_stub_server
+
+def write_lines(path, lines):
+    path.write_bytes("".join(lines).encode("utf-8"))
+
+def test_load_checkpoint_missing_file(tmp_path):
+    assert load_checkpoint(str(tmp_path / "out.jsonl")) == set()
+
+def test_load_checkpoint_keeps_complete_lines(tmp_path):
+    path = tmp_path / "out.jsonl"
+    lines = [json.dumps({"id": i, "sections": {}}) + "\n" for i in (1, 2, 3)]
+    write_lines(path, lines)
+    assert load_checkpoint(str(path)) == {1, 2, 3}
+    assert path.read_bytes() == "".join(lines).encode("utf-8")
+
+def test_load_checkpoint_truncates_torn_final_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    good = [json.dumps({"id": "a"}) + "\n", json.dumps({"id": "b", "note": "naïve"}) + "\n"]
+    write_lines(path, good + ['{"id": "c", "sect'])
+    assert load_checkpoint(str(path)) == {"a", "b"}
+    assert path.read_bytes() == "".join(good).encode("utf-8")
+    # Appending after the truncation leaves a readable file.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "c"}) + "\n")
+    assert load_checkpoint(str(path)) == {"a", "b", "c"}
+
+def test_load_checkpoint_stops_at_line_without_id(tmp_path):
+    path = tmp_path / "out.jsonl"
+    write_lines(path, [json.dumps({"id": 1}) + "\n", json.dumps({"oops": 1}) + "\n", json.dumps({"id": 2}) + "\n"])
+    assert load_checkpoint(str(path)) == {1}
+    assert path.read_text(encoding="utf-8") == json.dumps({"id": 1}) + "\n"
+
+def test_read_profiles_defaults_id_to_line_number(tmp_path):
+    path = tmp_path / "in.jsonl"
+    write_lines(path, [json.dumps({"age": 30}) + "\n", "\n", json.dumps({"id": "x"}) + "\n", json.dumps({}) + "\n"])
+    assert [record["id"] for record in read_profiles(str(path))] == [1, "x", 4]
+
+PROFILE = {"age": 28, "experience": "3", "target_role": "Data Analyst", "education": "BSc", "location": "Pune"}
+
+def test_validate_profile_accepts_complete_profile():
+    validate_profile(PROFILE)
+
+def test_validate_profile_names_missing_fields():
+    record = dict(PROFILE, target_role="", location=None)
+    del record["age"]
+    with pytest.raises(ValueError, match=r"missing required field\(s\): age, target_role, location"):
+        validate_profile(record)
+
+def test_validate_profile_rejects_non_integer_age():
+    with pytest.raises(ValueError, match="age must be a whole number, got 'twenty'"):
+        validate_profile(dict(PROFILE, age="twenty"))
+
+def test_read_profiles_reports_malformed_lines(tmp_path):
+    path = tmp_path / "in.jsonl"
+    write_lines(path, [json.dumps({"id": "a"}) + "\n", "{bad json\n", '["a"]\n', json.dumps({"id": [1]}) + "\n",
+                       json.dumps({"id": "b"}) + "\n"])
+    problems = []
+    ids = [record["id"] for record in read_profiles(str(path), on_error=lambda *args: problems.append(args))]
+    assert ids == ["a", "b"]
+    assert [line_no for line_no, _ in problems] == [2, 3, 4]
+    assert problems[0][1].startswith("invalid JSON")
+    assert problems[1][1] == "expected a JSON object, got list"
+    assert problems[2][1] == "id must be a string or integer, got [1]"
+
+class FakeAdvisor:
+    def advise(self, record):
+        validate_profile(record)
+        return {"career": f"advice for {record['id']}"}, 0.001
+
+def test_run_batch_skips_malformed_lines_and_resumes(tmp_path):
+    input_path, output_path, errors_path = (str(tmp_path / name) for name in ("in.jsonl", "out.jsonl", "err.jsonl"))
+    profiles = [json.dumps(dict(PROFILE, id=f"p{i}")) + "\n" for i in range(10)]
+    write_lines(tmp_path / "in.jsonl", profiles[:6] + ["{bad json\n", '["a"]\n'] + profiles[6:])
+    log = io.StringIO()
+
+    summary = run_batch(FakeAdvisor(), input_path, output_path, concurrency=2, errors_path=errors_path, log=log)
+    assert (summary["ok"], summary["failed"], summary["skipped"]) == (10, 2, 0)
+    assert load_checkpoint(output_path) == {f"p{i}" for i in range(10)}
+    with open(errors_path, encoding="utf-8") as f:
+        errors = [json.loads(line) for line in f]
+    assert [error["id"] for error in errors] == [7, 8]
+    assert "profile 7: invalid JSON" in log.getvalue()
+
+    summary = run_batch(FakeAdvisor(), input_path, output_path, concurrency=2, errors_path=errors_path, log=log)
+    assert (summary["ok"], summary["failed"], summary["skipped"]) == (0, 2, 10)
+
+def test_main_against_stub_server(tmp_path, capsys):
+    server = start_stub_server()
+    try:
+        input_path, output_path, errors_path = (str(tmp_path / name) for name in ("in.jsonl", "out.jsonl", "err.jsonl"))
+        write_lines(tmp_path / "in.jsonl", [json.dumps(dict(PROFILE, id=1)) + "\n", "{bad json\n",
+                                            json.dumps(dict(PROFILE, id=2, age=None)) + "\n"])
+        status = main([input_path, output_path, "--errors", errors_path, "--token", "stub", "--no-taxonomy",
+                       "--api-base", f"http://127.0.0.1:{server.server_port}/v1beta"])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert status == 1
+    assert "ok=1 failed=2 skipped=0" in capsys.readouterr().out
+    assert load_checkpoint(output_path) == {1}
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import datetime
+import pickle
+import threading
+import time
+
+import pytest
+
+import credentials
+from credentials import CredentialProvider
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+class FakeCreds:
+    # Mimics google.oauth2.credentials.Credentials: refresh() issues a new
+    # token valid for lifetime seconds.
+    def __init__(self, seconds_left, lifetime=3600, fail_refreshes=0):
+        self.generation = 0
+        self.token = "token-0"
+        self.expiry = utcnow() + datetime.timedelta(seconds=seconds_left)
+        self.refresh_token = "refresh"
+        self.lifetime = lifetime
+        self.fail_refreshes = fail_refreshes
+        self.refreshes = 0
+
+    @property
+    def expired(self):
+        return utcnow() >= self.expiry
+
+    @property
+    def valid(self):
+        return not self.expired
+
+    def refresh(self, request):
+        self.refreshes += 1
+        if self.fail_refreshes:
+            self.fail_refreshes -= 1
+            raise RuntimeError("token endpoint unavailable")
+        time.sleep(0.01)
+        self.generation += 1
+        self.token = f"token-{self.generation}"
+        self.expiry = utcnow() + datetime.timedelta(seconds=self.lifetime)
+
+def write_token(path, creds):
+    with open(path, "wb") as f:
+        pickle.dump(creds, f)
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition never became true"
+        time.sleep(0.005)
+
+@pytest.fixture
+def token_file(tmp_path):
+    return str(tmp_path / "token.pickle")
+
+@pytest.fixture
+def providers():
+    started = []
+
+    def make(token_file, **kwargs):
+        provider = CredentialProvider("credentials.json", token_file, ["scope"], **kwargs)
+        started.append(provider)
+        return provider
+
+    yield make
+    for provider in started:
+        provider.close()
+
+@pytest.fixture
+def no_background_refresh(monkeypatch):
+    monkeypatch.setattr(CredentialProvider, "_refresh_loop", lambda self: None)
+
+def test_static_token_needs_no_token_file(providers, token_file):
+    provider = providers(token_file, static_token="fixed")
+    assert provider.get_token() == "fixed"
+    assert provider._thread is None
+
+def test_valid_token_is_not_refreshed(providers, token_file):
+    write_token(token_file, FakeCreds(seconds_left=3600))
+    provider = providers(token_file, refresh_margin=300)
+    assert provider.get_token() == "token-0"
+    time.sleep(0.1)
+    assert provider._creds.refreshes == 0
+    assert provider.get_token() == "token-0"
+
+def test_background_refresh_inside_margin(providers, token_file):
+    write_token(token_file, FakeCreds(seconds_left=60))
+    provider = providers(token_file, refresh_margin=300)
+    wait_until(lambda: provider._creds.generation == 1)
+    assert provider.get_token() == "token-1"
+    assert provider._creds.refreshes == 1
+    # The refreshed token is saved for other processes.
+    with open(token_file, "rb") as f:
+        assert pickle.load(f).token == "token-1"
+
+def test_background_refresh_retries_after_a_failure(providers, token_file, monkeypatch):
+    monkeypatch.setattr(credentials, "RETRY_DELAY_SECONDS", 0.01)
+    write_token(token_file, FakeCreds(seconds_left=60, fail_refreshes=1))
+    provider = providers(token_file, refresh_margin=300)
+    # The current token stays in service while the refresh is failing.
+    assert provider.get_token() in ("token-0", "token-1")
+    wait_until(lambda: provider._creds.generation == 1)
+    assert provider._creds.refreshes == 2
+
+def test_inline_refresh_only_after_expiry(providers, token_file, no_background_refresh):
+    write_token(token_file, FakeCreds(seconds_left=30))
+    provider = providers(token_file, refresh_margin=300)
+    # Inside the margin but not expired: callers keep the current token.
+    assert provider.get_token() == "token-0"
+    assert provider._creds.refreshes == 0
+
+    provider._creds.expiry = utcnow() - datetime.timedelta(seconds=1)
+    barrier = threading.Barrier(8)
+
+    def get():
+        barrier.wait()
+        return provider.get_token()
+
+    threads_tokens = []
+    threads = [threading.Thread(target=lambda: threads_tokens.append(get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert threads_tokens == ["token-1"] * 8
+    assert provider._creds.refreshes == 1
+
+def test_refresh_uses_newer_token_saved_by_another_process(providers, token_file, no_background_refresh):
+    write_token(token_file, FakeCreds(seconds_left=30))
+    provider = providers(token_file, refresh_margin=300)
+    stale = provider._creds
+    stale.expiry = utcnow() - datetime.timedelta(seconds=1)
+
+    fresh = FakeCreds(seconds_left=3600)
+    fresh.token = "token-from-other-process"
+    write_token(token_file, fresh)
+
+    assert provider.get_token() == "token-from-other-process"
+    assert stale.refreshes == 0
+    assert provider._creds.refreshes == 0
+
+def test_expired_token_file_is_refreshed_on_start(providers, token_file):
+    write_token(token_file, FakeCreds(seconds_left=-10))
+    provider = providers(token_file, refresh_margin=300)
+    assert provider.get_token() == "token-1"
+    assert provider._creds.refreshes == 1
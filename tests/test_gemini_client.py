@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import pytest
+import requests
+
+import gemini_client
+from gemini_client import GeminiClient, TokenBucket
+from stub_gemini_server import start_stub_server
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Records retry delays instead of sleeping through them.
+    delays = []
+    monkeypatch.setattr(gemini_client.time, "sleep", delays.append)
+    return delays
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**config):
+        server = start_stub_server(**config)
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_port}/v1beta/models/stub:generateContent"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def make_client(**kwargs):
+    options = {"rate": 1000, "burst": 1000, "backoff_base": 0.5, "backoff_max": 8.0, "max_retries": 3}
+    options.update(kwargs)
+    return GeminiClient(**options)
+
+def test_retry_after_seconds_is_honoured_on_429(stub, sleeps):
+    server, url = stub(fail_first=2, error_status=429, retry_after=3)
+    client = make_client()
+    res = client.post(url, json={})
+    assert res.status_code == 200
+    assert sleeps == [3.0, 3.0]
+    assert server.config.requests == 3
+    stats = client.stats()
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
+
+def test_retry_after_is_capped_by_backoff_max(stub, sleeps):
+    _, url = stub(fail_first=1, error_status=503, retry_after=120)
+    client = make_client(backoff_max=8.0)
+    assert client.post(url, json={}).ok
+    assert sleeps == [8.0]
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504, 429])
+def test_backoff_without_retry_after_uses_full_jitter(stub, sleeps, status):
+    _, url = stub(fail_first=3, error_status=status)
+    client = make_client(backoff_base=0.5, backoff_max=1.5)
+    assert client.post(url, json={}).ok
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps):
+        assert 0.0 <= delay <= min(1.5, 0.5 * 2 ** attempt)
+
+def test_gives_up_after_max_retries(stub, sleeps):
+    server, url = stub(fail_first=10, error_status=503)
+    client = make_client(max_retries=2)
+    with pytest.raises(requests.HTTPError) as excinfo:
+        client.post(url, json={})
+    assert excinfo.value.response.status_code == 503
+    assert server.config.requests == 3
+    assert len(sleeps) == 2
+    stats = client.stats()
+    assert stats["retries"] == 2
+    assert stats["failures"] == 1
+
+def test_non_retryable_status_fails_immediately(stub, sleeps):
+    server, url = stub(fail_first=1, error_status=400)
+    client = make_client()
+    with pytest.raises(requests.HTTPError):
+        client.post(url, json={})
+    assert server.config.requests == 1
+    assert sleeps == []
+    assert client.stats()["failures"] == 1
+
+def test_retry_after_http_date(monkeypatch):
+    res = requests.Response()
+    res.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:10 GMT"
+    monkeypatch.setattr(gemini_client.time, "time", lambda: 1445412485.0)
+    assert gemini_client._retry_after_seconds(res) == pytest.approx(5.0)
+    res.headers["Retry-After"] = "soon"
+    assert gemini_client._retry_after_seconds(res) is None
+
+def test_token_bucket_times_out_when_empty():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.01)
+    assert bucket.stats()["acquired"] == 1
+
+@pytest.mark.parametrize("status", [400, 503])
+def test_failed_streaming_response_is_closed(stub, sleeps, status):
+    _, url = stub(fail_first=10, error_status=status)
+    client = make_client(max_retries=1)
+    with pytest.raises(requests.HTTPError) as excinfo:
+        client.post(url, json={}, stream=True)
+    assert excinfo.value.response.raw.closed
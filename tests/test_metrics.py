@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+
+import pytest
+
+from metrics import Histogram, PhaseMetrics, start_periodic_export
+
+BUCKETS = (1.0, 2.0, 4.0, float("inf"))
+
+def test_quantile_interpolates_within_bucket():
+    hist = Histogram(BUCKETS)
+    for seconds in (0.5, 0.5, 1.5, 1.5):
+        hist.observe(seconds)
+    assert hist.quantile(0.5) == pytest.approx(1.0)
+    assert hist.quantile(0.75) == pytest.approx(1.5)
+    assert hist.quantile(1.0) == pytest.approx(2.0)
+
+def test_quantile_skips_empty_buckets():
+    hist = Histogram(BUCKETS)
+    hist.observe(3.0)
+    assert hist.quantile(0.5) == pytest.approx(3.0)
+    assert hist.quantile(0.0) == pytest.approx(2.0)
+
+def test_quantile_in_inf_bucket_returns_its_lower_bound():
+    hist = Histogram(BUCKETS)
+    hist.observe(0.5)
+    hist.observe(100.0)
+    assert hist.quantile(0.99) == 4.0
+
+def test_quantile_of_empty_histogram():
+    assert Histogram(BUCKETS).quantile(0.5) == 0.0
+
+def test_bucket_bounds_are_inclusive():
+    hist = Histogram(BUCKETS)
+    hist.observe(1.0)
+    hist.observe(1.0000001)
+    assert hist.state()[0] == [1, 1, 0, 0]
+
+def test_snapshot():
+    hist = Histogram(BUCKETS)
+    hist.observe(1.0)
+    hist.observe(3.0)
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 2
+    assert snapshot["sum"] == pytest.approx(4.0)
+    assert snapshot["mean"] == pytest.approx(2.0)
+
+def test_prometheus_text_format():
+    metrics = PhaseMetrics(name="test_seconds", buckets=BUCKETS, namespace="app")
+    metrics.observe("parse", 0.5)
+    metrics.observe("parse", 3.0)
+    metrics.observe("parse", 9.0)
+    metrics.observe("http", 1.5)
+    metrics.register("cache", lambda: {"hits": 3, "hit_rate": 0.75, "disk_enabled": True,
+                                       "limiter": {"queue_depth": 2}, "name": "ignored"})
+    assert metrics.to_prometheus().splitlines() == [
+        "# HELP test_seconds Time spent per advisor phase.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{phase="http",le="1.0"} 0',
+        'test_seconds_bucket{phase="http",le="2.0"} 1',
+        'test_seconds_bucket{phase="http",le="4.0"} 1',
+        'test_seconds_bucket{phase="http",le="+Inf"} 1',
+        'test_seconds_sum{phase="http"} 1.5',
+        'test_seconds_count{phase="http"} 1',
+        'test_seconds_bucket{phase="parse",le="1.0"} 1',
+        'test_seconds_bucket{phase="parse",le="2.0"} 1',
+        'test_seconds_bucket{phase="parse",le="4.0"} 2',
+        'test_seconds_bucket{phase="parse",le="+Inf"} 3',
+        'test_seconds_sum{phase="parse"} 12.5',
+        'test_seconds_count{phase="parse"} 3',
+        "# TYPE app_cache_hits gauge",
+        "app_cache_hits 3",
+        "# TYPE app_cache_hit_rate gauge",
+        "app_cache_hit_rate 0.75",
+        "# TYPE app_cache_disk_enabled gauge",
+        "app_cache_disk_enabled 1",
+        "# TYPE app_cache_limiter_queue_depth gauge",
+        "app_cache_limiter_queue_depth 2",
+    ]
+
+def test_merge_state_adds_bucket_counts():
+    first, second = PhaseMetrics(buckets=BUCKETS), PhaseMetrics(buckets=BUCKETS)
+    first.observe("parse", 0.5)
+    second.observe("parse", 3.0)
+    second.observe("render", 1.5)
+    first.merge_state(second.export_state())
+    snapshot = first.snapshot()
+    assert snapshot["parse"]["count"] == 2
+    assert snapshot["parse"]["sum"] == pytest.approx(3.5)
+    assert snapshot["render"]["count"] == 1
+
+def test_write_json(tmp_path):
+    metrics = PhaseMetrics(buckets=BUCKETS)
+    metrics.observe("parse", 0.5)
+    metrics.register("client", lambda: {"requests": 2})
+    path = tmp_path / "metrics.json"
+    metrics.write_json(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["phases"]["parse"]["count"] == 1
+    assert data["components"] == {"client": {"requests": 2}}
+
+def test_periodic_export_survives_a_failing_stats_callback(tmp_path, capsys):
+    metrics = PhaseMetrics(buckets=BUCKETS)
+    calls = []
+
+    def stats():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("stats unavailable")
+        return {"requests": len(calls)}
+
+    metrics.register("client", stats)
+    path = tmp_path / "metrics.prom"
+    thread = start_periodic_export(metrics, prom_path=str(path), interval=0.01)
+    deadline = time.monotonic() + 5
+    while not path.exists():
+        assert time.monotonic() < deadline, "export never succeeded"
+        time.sleep(0.01)
+    assert thread.is_alive()
+    assert "advisor_client_requests" in path.read_text(encoding="utf-8")
+    assert "stats unavailable" in capsys.readouterr().err
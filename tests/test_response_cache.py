@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+import threading
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, normalize_profile, profile_key
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+def disk_rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+def test_profile_key_ignores_case_whitespace_and_skill_order():
+    a = normalize_profile("30", 5, [("Python", "Expert"), ("SQL", "")], "Data  Analyst", "BSc", "Pune")
+    b = normalize_profile(30, "5", [("sql", ""), (" python", "expert"), ("", "x")], "data analyst", "bsc ", "pune")
+    assert profile_key(a) == profile_key(b)
+    assert profile_key(a) != profile_key(dict(a, location="delhi"))
+
+def test_memory_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=60)
+    cache.set("k", {"career": "Analyst"})
+    clock[0] += 59
+    assert cache.get("k") == {"career": "Analyst"}
+    clock[0] += 1
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["expired"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 0
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_tier_serves_entries_evicted_from_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path, max_entries=1)
+    cache.set("a", {"roadmap": ["SQL"]})
+    cache.set("b", {"roadmap": ["Python"]})
+    assert cache.get("a") == {"roadmap": ["SQL"]}
+    stats = cache.stats()
+    assert stats["disk_enabled"]
+    assert stats["disk_hits"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path=path).set("a", [1, 2])
+    assert ResponseCache(path=path).get("a") == [1, 2]
+
+def test_disk_entries_expire_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path=path, ttl=60).set("a", 1)
+    clock[0] += 61
+    cache = ResponseCache(path=path, ttl=60)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+    assert disk_rows(path) == 0
+
+def test_disk_sweep_runs_every_interval(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path, max_entries=1, max_disk_entries=3, sweep_interval=4)
+    for i in range(6):
+        clock[0] += 1
+        cache.set(f"k{i}", i)
+    # The sweep after the fourth write trimmed the table back to three rows.
+    assert disk_rows(path) == 5
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.get("k0") is None
+    assert cache.get("k1") == 1
+    for i in range(6, 8):
+        clock[0] += 1
+        cache.set(f"k{i}", i)
+    assert disk_rows(path) == 3
+    assert cache.stats()["disk_evictions"] == 5
+    assert cache.get("k4") is None
+    assert cache.get("k5") == 5
+
+def test_unusable_disk_path_falls_back_to_memory(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "missing" / "cache.sqlite3"))
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert not cache.stats()["disk_enabled"]
+
+def test_concurrent_readers_and_writers(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=8, sweep_interval=16)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                key = f"k{(n * 7 + i) % 50}"
+                cache.set(key, {"n": i})
+                cache.get(key)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = cache.stats()
+    assert stats["hits"] + stats["disk_hits"] + stats["misses"] == 1600
+    assert stats["entries"] <= 8
+
+def test_clear_empties_both_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+    assert disk_rows(path) == 0
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import re
+
+from roadmap import COMPLETED_COLOR, generate_graphviz_roadmap
+
+STEPS = ("Learn SQL", "Build dashboards", "Apply")
+
+def strip_colours(source):
+    return re.sub(r"(fill|font)color=\S+", "", source)
+
+def test_completed_steps_change_only_colours():
+    plain = generate_graphviz_roadmap(STEPS).source
+    ticked = generate_graphviz_roadmap(STEPS, (True, False, True)).source
+    assert ticked != plain
+    assert strip_colours(ticked) == strip_colours(plain)
+    assert ticked.count(COMPLETED_COLOR) == 2
+
+def test_short_completion_tuple_leaves_later_steps_open():
+    assert generate_graphviz_roadmap(STEPS, (True,)).source.count(COMPLETED_COLOR) == 1
+
+def test_steps_are_chained_in_order():
+    source = generate_graphviz_roadmap(STEPS).source
+    assert re.findall(r"(\d+) -> (\d+)", source) == [("0", "1"), ("1", "2")]
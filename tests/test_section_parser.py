@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from section_parser import SECTION_KEYS, coerce_section, decode_structured, has_content, parse_sections
+
+@pytest.mark.parametrize("header", [
+    "Roadmap",
+    "roadmap",
+    "## Roadmap",
+    "### Career Roadmap:",
+    "**Roadmap**",
+    "**Roadmap:**",
+    "**Roadmap**:",
+    "3. Roadmap",
+    "3) Career Roadmap",
+    "  Roadmap  ",
+])
+def test_decorated_headers_switch_section(header):
+    sections = parse_sections(f"{header}\n- Learn SQL\n- Build dashboards\n")
+    assert sections["roadmap"] == ["Learn SQL", "Build dashboards"]
+    assert sections["career"] == ""
+
+def test_inline_content_after_colon():
+    sections = parse_sections("Practice Websites: LeetCode, Kaggle\n**Skill Gap:** Statistics\n")
+    assert sections["practice_websites"] == ["LeetCode", "Kaggle"]
+    assert sections["skill_gap"] == "Statistics"
+
+def test_header_word_with_trailing_text_is_content():
+    sections = parse_sections("Skill Gap\nRoadmap planning is key\nCareers: a note\n")
+    assert sections["skill_gap"] == "Roadmap planning is key"
+    assert sections["career"] == "a note"
+
+def test_colon_in_ordinary_content_is_kept():
+    sections = parse_sections("Career Suggestions\nData Analyst: strong fit for your SQL\n")
+    assert sections["career"] == "Data Analyst: strong fit for your SQL"
+
+def test_long_line_is_never_a_header():
+    line = "Roadmap " + "x" * 80
+    assert parse_sections(f"Skill Gap\n{line}\n")["skill_gap"] == line
+
+def test_text_before_any_header_is_career():
+    sections = parse_sections("You would suit analytics.\n\nSkill Gap\nStatistics\n")
+    assert sections["career"] == "You would suit analytics."
+    assert sections["skill_gap"] == "Statistics"
+
+def test_list_bullets_and_bold_are_stripped():
+    text = "Learning Resources\n- **Coursera**\n* Udemy, edX\n• Khan Academy\n1. freeCodeCamp\n2) Kaggle Learn\n"
+    assert parse_sections(text)["learning"] == [
+        "Coursera", "Udemy", "edX", "Khan Academy", "freeCodeCamp", "Kaggle Learn",
+    ]
+
+def test_bullets_are_kept_in_text_sections():
+    assert parse_sections("Skill Gap\n- Statistics\n")["skill_gap"] == "- Statistics"
+
+def test_crlf_and_blank_lines():
+    sections = parse_sections("Career Suggestions\r\n\r\nAnalyst\r\nJob Platforms\r\n- LinkedIn\r\n")
+    assert sections["career"] == "Analyst"
+    assert sections["job_platforms"] == ["LinkedIn"]
+
+def test_repeated_header_appends():
+    sections = parse_sections("Roadmap\n- a\nSkill Gap\nSQL\nRoadmap\n- b\n")
+    assert sections["roadmap"] == ["a", "b"]
+
+def test_empty_input_has_every_key():
+    sections = parse_sections("")
+    assert set(sections) == set(SECTION_KEYS)
+    assert not has_content(sections)
+
+def test_coerce_section():
+    assert coerce_section("roadmap", "- a\n\n- b, c") == ["a", "b", "c"]
+    assert coerce_section("roadmap", [" a ", "", 3]) == ["a", "3"]
+    assert coerce_section("career", [" a ", "b"]) == "a\nb"
+    assert coerce_section("career", None) == ""
+
+def test_decode_structured_falls_back_to_text():
+    payload = json.dumps({"career": "Analyst", "roadmap": ["SQL"]})
+    sections = decode_structured(payload)
+    assert sections["career"] == "Analyst"
+    assert sections["roadmap"] == ["SQL"]
+    assert sections["learning"] == []
+    assert decode_structured("Roadmap\n- SQL")["roadmap"] == ["SQL"]
+
+@pytest.mark.parametrize("text", [
+    '{\n"career": "Data analyst roles suit you",\n"roadmap": ["Learn SQL", "Bui',
+    '  {"career": "x"',
+    '[1, 2]',
+    '["career", "Analyst"',
+])
+def test_decode_structured_rejects_broken_json(text):
+    with pytest.raises(ValueError):
+        decode_structured(text)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight, prompt_key
+
+def wait_for_leader(flight, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.stats()["in_flight"] == 0:
+        assert time.monotonic() < deadline, "leader never started"
+        time.sleep(0.001)
+
+def wait_for_waiters(flight, key, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.waiters(key) < count:
+        assert time.monotonic() < deadline, "waiters never joined"
+        time.sleep(0.001)
+
+def run_with_waiters(flight, leader_fn, waiters=3, timeout=None):
+    # Starts a leader blocked on an event, joins waiters to it, then releases it.
+    release = threading.Event()
+
+    def leader():
+        release.wait(5)
+        return leader_fn()
+
+    pool = ThreadPoolExecutor(waiters + 1)
+    try:
+        leader_future = pool.submit(flight.do, "key", leader)
+        wait_for_leader(flight)
+        waiter_futures = [pool.submit(flight.do, "key", lambda: "not called", timeout) for _ in range(waiters)]
+        wait_for_waiters(flight, "key", waiters)
+        release.set()
+        return leader_future, waiter_futures
+    finally:
+        pool.shutdown(wait=True)
+
+def test_prompt_key_folds_case_and_whitespace():
+    assert prompt_key("Hello   World\n") == prompt_key("hello world")
+    assert prompt_key("hello world") != prompt_key("hello, world")
+
+def test_waiters_share_the_leader_result():
+    flight = SingleFlight()
+    calls = []
+    leader, waiters = run_with_waiters(flight, lambda: calls.append(1) or "advice")
+    assert leader.result() == "advice"
+    assert [w.result() for w in waiters] == ["advice"] * 3
+    assert calls == [1]
+    stats = flight.stats()
+    assert stats["calls"] == 1
+    assert stats["coalesced"] == 3
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+
+def test_exception_is_propagated_to_waiters():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("upstream failed")
+
+    leader, waiters = run_with_waiters(flight, fail)
+    with pytest.raises(ValueError, match="upstream failed"):
+        leader.result()
+    for waiter in waiters:
+        with pytest.raises(ValueError, match="upstream failed"):
+            waiter.result()
+    assert flight.stats()["errors"] == 1
+
+def test_base_exception_stays_with_the_leader():
+    flight = SingleFlight()
+
+    class Stop(BaseException):
+        pass
+
+    def stop():
+        raise Stop()
+
+    leader, waiters = run_with_waiters(flight, stop)
+    with pytest.raises(Stop):
+        leader.result()
+    for waiter in waiters:
+        with pytest.raises(RuntimeError, match="cancelled"):
+            waiter.result()
+    assert flight.stats()["in_flight"] == 0
+
+def test_waiter_times_out_without_cancelling_the_leader():
+    flight = SingleFlight()
+    release = threading.Event()
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "key", lambda: release.wait(5) and "late")
+        wait_for_leader(flight)
+        with pytest.raises(TimeoutError):
+            flight.do("key", lambda: "not called", timeout=0.05)
+        release.set()
+        assert leader.result() == "late"
+    stats = flight.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waiting"] == 0
+
+def test_max_wait_applies_when_no_timeout_is_given():
+    flight = SingleFlight(max_wait=0.05)
+    release = threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        pool.submit(flight.do, "key", lambda: release.wait(5))
+        wait_for_leader(flight)
+        with pytest.raises(TimeoutError):
+            flight.do("key", lambda: "not called")
+        release.set()
+
+def test_key_is_released_after_the_call():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["calls"] == 2
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from taxonomy import FuzzyMatcher, Taxonomy, load_taxonomy, normalize_term
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return load_taxonomy()
+
+def test_normalize_term_keeps_language_punctuation():
+    assert normalize_term(" Machine-Learning ") == "machine learning"
+    assert normalize_term("C++ / C#") == "c++ c#"
+    assert normalize_term("Node.js.") == "node.js"
+    assert normalize_term(None) == ""
+
+@pytest.mark.parametrize("field, text, expected", [
+    ("skill", "ML", "Machine Learning"),
+    ("skill", "Machine-Learning ", "Machine Learning"),
+    ("role", "Sr. Data Analyst", "Sr. Data Analyst"),
+    ("location", "bangalore", "Bengaluru, India"),
+    ("location", "WFH", "Remote"),
+])
+def test_exact_aliases(taxonomy, field, text, expected):
+    assert getattr(taxonomy, f"canonical_{field}")(text) == expected
+
+@pytest.mark.parametrize("field, text, expected", [
+    ("skill", "kubernets", "Kubernetes"),
+    ("skill", "pyton", "Python"),
+    ("skill", "javascrpt", "JavaScript"),
+    ("skill", "Projet Management", "Project Management"),
+    ("role", "data scientst", "Data Scientist"),
+    ("role", "Data Analyts", "Data Analyst"),
+    ("role", "Prodct Manger", "Product Manager"),
+    ("location", "san fransisco", "San Francisco Bay Area, USA"),
+])
+def test_typos_are_corrected(taxonomy, field, text, expected):
+    assert getattr(taxonomy, f"canonical_{field}")(text) == expected
+
+@pytest.mark.parametrize("field, text", [
+    ("role", "Production Manager"),
+    ("role", "Mobile Game Developer"),
+    ("role", "Senior Product Manager"),
+    ("role", "Business Analyst"),
+    ("role", "astronaut"),
+    ("skill", "Product Management"),
+    ("skill", "Excel VBA"),
+    ("skill", "Javva"),
+    ("location", "uae"),
+    ("location", "anywhere"),
+    ("location", "Reykjavik"),
+])
+def test_different_terms_pass_through_unchanged(taxonomy, field, text):
+    assert getattr(taxonomy, f"canonical_{field}")(text) == text
+
+def test_unknown_values_are_trimmed(taxonomy):
+    assert taxonomy.canonical_role("  Deep   Sea Welder ") == "Deep Sea Welder"
+
+def test_typo_edits_are_capped():
+    matcher = FuzzyMatcher({"Alpha Bravo Charlie": []})
+    assert matcher.match("alpah bravo charlie") == "Alpha Bravo Charlie"
+    assert matcher.match("alpah bravo charlei") == "Alpha Bravo Charlie"
+    assert matcher.match("alpah bravl charlei") is None
+
+def test_short_words_must_match_exactly():
+    matcher = FuzzyMatcher({"Game Design": [], "Java": []})
+    assert matcher.match("gane design") is None
+    assert matcher.match("game desing") == "Game Design"
+    assert matcher.match("jaba") is None
+
+def test_static_sections_copy_catalog_entries():
+    taxonomy = Taxonomy({"catalog": {"Data Analyst": {"practice_websites": ["Kaggle"], "job_platforms": []}}})
+    sections = taxonomy.static_sections("Data Analyst")
+    assert sections == {"practice_websites": ["Kaggle"]}
+    sections["practice_websites"].append("x")
+    assert taxonomy.static_sections("Data Analyst") == {"practice_websites": ["Kaggle"]}
+    assert taxonomy.static_sections("Astronaut") == {}